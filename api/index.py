@@ -23,18 +23,24 @@ except ImportError as e:
                 template_folder='../templates',
                 static_folder='../static')
     
-    @app.route('/')
-    def error():
-        return f'''
+    # Gather debug details once; they don't change during an invocation
+    _import_error = str(e)
+    _debug_info = {
+        'cwd': os.getcwd(),
+        'root_files': os.listdir('..'),
+        'api_files': os.listdir('.')
+    }
+
+    _ERROR_HTML = f'''
         <h1>🔧 PM Internship Portal - Import Debug</h1>
-        <p><strong>Import Error:</strong> {e}</p>
+        <p><strong>Import Error:</strong> {_import_error}</p>
         
         <h2>🔍 Debug Information:</h2>
         <ul>
-            <li><strong>Current Directory:</strong> {os.getcwd()}</li>
+            <li><strong>Current Directory:</strong> {_debug_info['cwd']}</li>
             <li><strong>Python Path:</strong> {sys.path}</li>
-            <li><strong>Files in Root:</strong> {os.listdir('..')}</li>
-            <li><strong>Files in API:</strong> {os.listdir('.')}</li>
+            <li><strong>Files in Root:</strong> {_debug_info['root_files']}</li>
+            <li><strong>Files in API:</strong> {_debug_info['api_files']}</li>
         </ul>
         
         <h2>📋 Expected Structure:</h2>
@@ -49,26 +55,29 @@ your-project/
         </pre>
         
         <p><a href="/test">Test Basic Functionality</a></p>
-        '''
+        '''.encode('utf-8')
+
+    _TEST_PAYLOAD = {
+        'status': 'error',
+        'message': f'Import failed: {_import_error}',
+        'debug': _debug_info
+    }
+    
+    @app.route('/')
+    def error():
+        return _ERROR_HTML, 500, {'Content-Type': 'text/html; charset=utf-8'}
     
     @app.route('/test')
     def test():
-        return {
-            'status': 'error',
-            'message': f'Import failed: {e}',
-            'debug': {
-                'cwd': os.getcwd(),
-                'root_files': os.listdir('..'),
-                'api_files': os.listdir('.')
-            }
-        }
+        return _TEST_PAYLOAD
 
 except Exception as e:
     print(f"❌ Unexpected error: {e}")
     
     from flask import Flask
     app = Flask(__name__)
+    _UNEXPECTED_HTML = f'<h1>❌ Unexpected Error</h1><p>{e}</p>'
     
     @app.route('/')
     def unexpected_error():
-        return f'<h1>❌ Unexpected Error</h1><p>{e}</p>'
+        return _UNEXPECTED_HTML
@@ -1,51 +1,62 @@
 from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, g, has_request_context, make_response, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from supabase import create_client, Client
-from functools import wraps
+from functools import wraps, lru_cache
 from threading import Lock
-from typing import Optional
+import threading
+import atexit
+import queue
+import time
+from typing import Optional, TYPE_CHECKING
 import re
-import difflib
+import hashlib
+import shutil
 from datetime import datetime, timedelta, timezone
 import io
-import google.generativeai as genai
 import os
 import json
+import logging
 import random
-from dotenv import load_dotenv
-# Language detection for multilingual support
+import heapq
+from operator import itemgetter
+from text_similarity import similarity_ratio
+
+# orjson parses several times faster than the stdlib; json stays as the fallback
 try:
-    from langdetect import detect
-    from langdetect.lang_detect_exception import LangDetectException
-    LANGDETECT_AVAILABLE = True
-    print("✅ Language detection (langdetect) available")
-except ImportError as e:
-    LANGDETECT_AVAILABLE = False
-    print(f"⚠️ langdetect not available: {e}")
-    print("Using fallback language detection based on word patterns")
-
-# 🔧 NEW: Import for PDF generation
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
-from reportlab.platypus.flowables import HRFlowable
-from reportlab.pdfgen import canvas
-
-
-
-# Load environment variables
-load_dotenv()
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj):
+        """Serialise to a JSON str with orjson."""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+# Supabase, langdetect, ReportLab and the ATS analyzer (PyPDF2/python-docx) are
+# imported on first use so cold starts for ordinary page views skip them
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+
+# Load environment variables from a .env file, searched for upward from this file
+# as load_dotenv() does; deployed environments (e.g. Vercel) inject them directly,
+# so nothing is parsed when no .env is found
+from dotenv import find_dotenv
+_ENV_FILE = find_dotenv()
+if _ENV_FILE:
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE)
 
 # Captcha Functions
+CAPTCHA_OPERATIONS = ('+', '-', '*')
+
 def generate_captcha():
     """Generate a simple math captcha"""
     num1 = random.randint(1, 20)
     num2 = random.randint(1, 20)
-    operation = random.choice(['+', '-', '*'])
+    operation = random.choice(CAPTCHA_OPERATIONS)
     
     if operation == '+':
         answer = num1 + num2
@@ -72,20 +83,88 @@ def verify_captcha(user_answer, correct_answer):
     except (ValueError, TypeError):
         return False
 
+def render_captcha_page(template_name):
+    """Render a login/signup page with a fresh captcha, remembering its answer"""
+    captcha_question, captcha_answer_correct = generate_captcha()
+    session['captcha_answer'] = captcha_answer_correct
+    return render_template(template_name, captcha_question=captcha_question)
+
 # Flask application setup
+class FastJSONProvider(DefaultJSONProvider):
+    """Parse request bodies with json_loads (orjson when installed)."""
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return json_loads(s)
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.secret_key = os.getenv("FLASK_SECRET_KEY", 'your-super-secret-key-change-this-in-production')
 
 # Configure session settings
-app.config['SESSION_TYPE'] = 'filesystem'
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 app.config['SESSION_COOKIE_SECURE'] = False
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
+# Compress HTML/JSON/CSS/JS responses (brotli first, gzip for older clients)
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+try:
+    from flask_compress import Compress
+    Compress(app)
+except ImportError:
+    print("⚠️ flask-compress not available; responses are sent uncompressed")
+
+# Password hashing cost, resolved once at startup. Production keeps Werkzeug's
+# full-strength default; local development (FLASK_DEBUG) uses fewer KDF
+# iterations so signup/login stay fast. PASSWORD_HASH_METHOD overrides both.
+# These only apply when argon2-cffi is unavailable.
+DEV_MODE = os.getenv('FLASK_DEBUG', '').lower() in ('1', 'true')
+PASSWORD_HASH_METHOD = os.getenv(
+    'PASSWORD_HASH_METHOD',
+    'pbkdf2:sha256:120000' if DEV_MODE else 'pbkdf2:sha256:600000'
+)
+
+# Per-request debug traces go through a level-gated logger: shown under FLASK_DEBUG,
+# skipped (without formatting their arguments) in production
+logger = logging.getLogger(__name__)
+if DEV_MODE:
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(logging.StreamHandler())
+
+# Argon2id (C implementation) for new password hashes; existing Werkzeug
+# hashes still verify and are upgraded on the next successful login
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+    PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+    ARGON2_AVAILABLE = True
+except ImportError:
+    PASSWORD_HASHER = None
+    ARGON2_AVAILABLE = False
+    print("⚠️ argon2-cffi not available; using Werkzeug password hashes")
+
 # Gemini / Google Generative AI configuration (lazy-loaded)
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+# Upper bounds on a Gemini call so a slow generation cannot hold a worker indefinitely
+GEMINI_CHAT_TIMEOUT = 15  # seconds
+GEMINI_RECOMMENDATIONS_TIMEOUT = 30  # seconds
+# Generation settings built once; the SDK accepts plain dicts, so the SDK import stays lazy
+GEMINI_CHAT_GENERATION_CONFIG = {
+    'max_output_tokens': 400,  # Reduced for faster responses
+    'temperature': 0.8,        # Slightly more creative
+    'top_p': 0.95,             # Better response quality
+    'top_k': 50,               # More diverse vocabulary
+}
+GEMINI_RECOMMENDATIONS_GENERATION_CONFIG = {
+    'max_output_tokens': 1000,  # Increased for better responses
+    'temperature': 0.7,
+}
 _gemini_model = None
 _gemini_model_error = None
+_gemini_chat_model = None
 _gemini_lock = Lock()
 
 
@@ -108,14 +187,16 @@ def get_gemini_model():
             return _gemini_model
 
         try:
+            # Imported here so cold starts for non-chat routes skip the SDK
+            import google.generativeai as genai
             genai.configure(api_key=gemini_key)
-            _gemini_model = genai.GenerativeModel('gemini-pro')
-            print("✅ Gemini Pro configured (lazy)")
+            _gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+            print("✅ Gemini configured (lazy)")
         except Exception as model_error:
-            print(f"⚠️ Gemini Pro initialization failed: {model_error}")
+            print(f"⚠️ Gemini initialization failed: {model_error}")
             try:
-                _gemini_model = genai.GenerativeModel('gemini-pro')
-                print("✅ Gemini Pro configured (lazy fallback)")
+                _gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+                print("✅ Gemini configured (lazy fallback)")
             except Exception as fallback_error:
                 _gemini_model_error = f"Gemini init failed: {fallback_error}"
                 _gemini_model = None
@@ -124,51 +205,228 @@ def get_gemini_model():
 
     return _gemini_model
 
-# Configure Supabase
-try:
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_KEY")
 
-    if not supabase_url or not supabase_key:
-        raise Exception("Missing SUPABASE_URL or SUPABASE_KEY in environment")
+def get_gemini_chat_model():
+    """Chat model carrying the static PRIA knowledge base as its system instruction.
+
+    Sending the fixed persona through the system-instruction slot (instead of
+    re-concatenating it into every prompt) keeps per-request input small and the
+    prefix identical across users, so Gemini's prefix caching can reuse it.
+    """
+    global _gemini_chat_model
+
+    if _gemini_chat_model or not get_gemini_model():
+        return _gemini_chat_model
+
+    with _gemini_lock:
+        if _gemini_chat_model is None:
+            import google.generativeai as genai
+            _gemini_chat_model = genai.GenerativeModel(
+                GEMINI_MODEL_NAME,
+                system_instruction=PRIA_SYSTEM_INSTRUCTION
+            )
+
+    return _gemini_chat_model
+
+
+# Supabase configuration (lazy-loaded, one client shared by the whole process)
+_supabase_client: Optional['Client'] = None
+_supabase_error = None
+_supabase_lock = Lock()
+
+SUPABASE_TIMEOUT = 10  # seconds
+# httpx only keeps idle connections for 5s by default; hold them for a minute so
+# sporadic requests reuse the TLS connection to Supabase instead of re-handshaking
+SUPABASE_MAX_CONNECTIONS = 32
+SUPABASE_KEEPALIVE_EXPIRY = 60  # seconds
+
+def _use_pooled_postgrest_session(client):
+    """Replace the PostgREST httpx session with one that keeps connections pooled longer."""
+    import httpx
+    from postgrest.utils import SyncClient as PostgrestSession
+
+    postgrest = client.postgrest
+    default_session = postgrest.session
+    postgrest.session = PostgrestSession(
+        base_url=default_session.base_url,
+        headers=default_session.headers,
+        timeout=default_session.timeout,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_CONNECTIONS,
+            keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY
+        )
+    )
+    default_session.close()
+
+
+def get_supabase() -> Optional['Client']:
+    """Return the process-wide Supabase client, connecting on first use.
+
+    The client keeps its PostgREST HTTP session (and its keep-alive connection
+    pool) for the life of the process, so every request reuses the same
+    connections instead of paying a fresh handshake.
+    """
+    global _supabase_client, _supabase_error
+
+    if _supabase_client or _supabase_error:
+        return _supabase_client
+
+    with _supabase_lock:
+        # Double-check inside lock to avoid duplicate initialization
+        if _supabase_client or _supabase_error:
+            return _supabase_client
+
+        try:
+            supabase_url = os.getenv("SUPABASE_URL")
+            supabase_key = os.getenv("SUPABASE_KEY")
+
+            if not supabase_url or not supabase_key:
+                raise Exception("Missing SUPABASE_URL or SUPABASE_KEY in environment")
+
+            from supabase import create_client
+            from supabase.lib.client_options import ClientOptions
+
+            _supabase_client = create_client(
+                supabase_url,
+                supabase_key,
+                options=ClientOptions(
+                    postgrest_client_timeout=SUPABASE_TIMEOUT,
+                    storage_client_timeout=SUPABASE_TIMEOUT
+                )
+            )
+            _use_pooled_postgrest_session(_supabase_client)
+            print("✅ Connected to Supabase successfully!")
+
+        except Exception as e:
+            _supabase_error = str(e)
+            print(f"❌ Supabase connection error: {e}")
+
+    return _supabase_client
 
-    supabase: Client = create_client(supabase_url, supabase_key)
-    print("✅ Connected to Supabase successfully!")
+
+@app.cli.command('check-db')
+def check_db_command():
+    """Verify Supabase connectivity once at deploy time: `flask --app app check-db`."""
+    supabase = get_supabase()
+    if not supabase:
+        print(f"❌ Supabase not available: {_supabase_error}")
+        raise SystemExit(1)
 
     try:
         supabase.table('users').select('id').limit(1).execute()
         print("✅ Database tables verified and accessible!")
-    except Exception:
-        print("⚠️ Database test query failed, but connection established")
-
-except Exception as e:
-    print(f"❌ Supabase connection error: {e}")
-    supabase = None
+    except Exception as e:
+        print(f"❌ Database test query failed: {e}")
+        raise SystemExit(1)
 
 # Configure upload settings for Vercel (use /tmp for serverless)
 UPLOAD_FOLDER = '/tmp/uploads' if os.environ.get('VERCEL') else 'static/uploads'
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'doc', 'docx', 'txt'}
+_ALLOWED_SUFFIXES = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
 # ==================== HELPER FUNCTIONS ====================
 
+# Keyword lists for pattern-based Hindi/Marathi detection
+HINDI_WORDS = frozenset(['कैसे', 'क्या', 'हाँ', 'नहीं', 'धन्यवाद', 'कहाँ', 'कब', 'कौन', 'कितना', 'मुझे', 'आप', 'हम', 'वह', 'मैं', 'तुम', 'यह', 'है', 'का', 'की', 'के', 'में', 'से', 'पर', 'को', 'भी', 'और', 'सब', 'कुछ', 'बहुत', 'अच्छा', 'बुरा', 'खाना', 'पानी', 'घर', 'काम', 'समय', 'दिन', 'रात', 'सुबह', 'शाम', 'पढ़ाई', 'स्कूल', 'कॉलेज', 'मित्र', 'दोस्त', 'परिवार', 'माता', 'पिता', 'भाई', 'बहन'])
+
+MARATHI_WORDS = frozenset(['कसे', 'काय', 'होय', 'नाही', 'धन्यवाद', 'कुठे', 'केव्हा', 'कोण', 'किती', 'मला', 'तुम्ही', 'आम्ही', 'तो', 'ती', 'हे', 'आहे', 'चा', 'ची', 'चे', 'मध्ये', 'पासून', 'वर', 'ला', 'सुद्धा', 'आणि', 'सर्व', 'काही', 'खूप', 'चांगले', 'वाईट', 'जेवण', 'पाणी', 'घर', 'काम', 'वेळ', 'दिवस', 'रात्र', 'सकाळ', 'संध्याकाळ', 'अभ्यास', 'शाळा', 'महाविद्यालय', 'मित्र', 'कुटुंब', 'आई', 'बाबा', 'भाऊ', 'बहीण'])
+
+def _build_language_word_matcher(words):
+    """Compile all keywords into one scan.
+
+    The lookahead alternation (longest words first) reports the longest keyword
+    starting at each position; every shorter keyword starting there is one of
+    its prefixes, so each match maps to the full set of keywords found at that
+    position.
+    """
+    ordered = sorted(words, key=len, reverse=True)
+    pattern = re.compile('(?=(' + '|'.join(re.escape(word) for word in ordered) + '))')
+    prefixes = {word: frozenset(w for w in words if word.startswith(w)) for word in words}
+    return pattern, prefixes
+
+LANGUAGE_WORD_PATTERN, LANGUAGE_WORD_PREFIXES = _build_language_word_matcher(HINDI_WORDS | MARATHI_WORDS)
+
+# Every Hindi/Marathi keyword is written in Devanagari (U+0900-U+097F)
+DEVANAGARI_PATTERN = re.compile('[\u0900-\u097f]')
+
+# langdetect only ever sees Devanagari or Arabic-script text (see
+# LANGDETECT_SCRIPT_PATTERN), so only those scripts' profiles are loaded; Arabic
+# and Persian stay in the set so they are not forced onto Urdu/Hindi
+LANGDETECT_PROFILES = ('en', 'hi', 'mr', 'ne', 'ur', 'ar', 'fa')
+LANGDETECT_SCRIPT_PATTERN = re.compile('[\u0900-\u097f\u0600-\u06ff]')
+_langdetect_factory = None
+_langdetect_error = None
+_langdetect_lock = Lock()
+
+def get_langdetect_factory():
+    """Build a langdetect factory with just LANGDETECT_PROFILES on first use.
+
+    langdetect's own detect() loads all 55 bundled profiles into memory; a
+    seven-profile factory is a fraction of the size and scores faster.
+    """
+    global _langdetect_factory, _langdetect_error
+
+    if _langdetect_factory is not None or _langdetect_error:
+        return _langdetect_factory
+
+    with _langdetect_lock:
+        if _langdetect_factory is None and not _langdetect_error:
+            # Any failure (missing package, unreadable or invalid profile) is recorded
+            # so later messages go straight to the word-pattern fallback
+            try:
+                from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+
+                profiles = []
+                for lang in LANGDETECT_PROFILES:
+                    with open(os.path.join(PROFILES_DIRECTORY, lang), encoding='utf-8') as profile_file:
+                        profiles.append(profile_file.read())
+                factory = DetectorFactory()
+                factory.load_json_profile(profiles)
+                _langdetect_factory = factory
+                print("✅ Language detection (langdetect) loaded")
+            except Exception as e:
+                _langdetect_error = str(e)
+                print(f"⚠️ langdetect not available: {e}")
+                print("Using fallback language detection based on word patterns")
+
+    return _langdetect_factory
+
+LANGUAGE_CACHE_MAX_LENGTH = 512
+
 def detect_user_language(text):
     """Detect language of user input with robust fallback"""
-    if not text or not text.strip():
+    if not text:
+        return "English"
+
+    text = text.strip()
+    # Short messages (greetings, FAQs) repeat a lot; long ones would only bloat the cache
+    if len(text) > LANGUAGE_CACHE_MAX_LENGTH:
+        return _detect_user_language_uncached(text)
+    return _detect_user_language_cached(text)
+
+def _detect_user_language_uncached(text):
+    """Word-pattern detection with langdetect fallback for already-stripped text"""
+    if not text:
         return "English"
     
-    # Enhanced word pattern detection (primary method now)
-    text_lower = text.lower()
-    
-    # Extended word lists for better detection
-    hindi_words = ['कैसे', 'क्या', 'हाँ', 'नहीं', 'धन्यवाद', 'कहाँ', 'कब', 'कौन', 'कितना', 'मुझे', 'आप', 'हम', 'वह', 'मैं', 'तुम', 'यह', 'है', 'का', 'की', 'के', 'में', 'से', 'पर', 'को', 'भी', 'और', 'सब', 'कुछ', 'बहुत', 'अच्छा', 'बुरा', 'खाना', 'पानी', 'घर', 'काम', 'समय', 'दिन', 'रात', 'सुबह', 'शाम', 'पढ़ाई', 'स्कूल', 'कॉलेज', 'मित्र', 'दोस्त', 'परिवार', 'माता', 'पिता', 'भाई', 'बहन']
+    # Every Hindi/Marathi signal is Devanagari, so plain ASCII text is English
+    if text.isascii():
+        return 'English'
     
-    marathi_words = ['कसे', 'काय', 'होय', 'नाही', 'धन्यवाद', 'कुठे', 'केव्हा', 'कोण', 'किती', 'मला', 'तुम्ही', 'आम्ही', 'तो', 'ती', 'हे', 'आहे', 'चा', 'ची', 'चे', 'मध्ये', 'पासून', 'वर', 'ला', 'सुद्धा', 'आणि', 'सर्व', 'काही', 'खूप', 'चांगले', 'वाईट', 'जेवण', 'पाणी', 'घर', 'काम', 'वेळ', 'दिवस', 'रात्र', 'सकाळ', 'संध्याकाळ', 'अभ्यास', 'शाळा', 'महाविद्यालय', 'मित्र', 'कुटुंब', 'आई', 'बाबा', 'भाऊ', 'बहीण']
+    # Collect every Hindi/Marathi keyword occurring in the text in one regex pass,
+    # skipped when there is no Devanagari for a keyword to match
+    has_devanagari = DEVANAGARI_PATTERN.search(text)
+    found = set()
+    if has_devanagari:
+        for match in LANGUAGE_WORD_PATTERN.finditer(text):
+            found.update(LANGUAGE_WORD_PREFIXES[match.group(1)])
     
     # Count matching words
-    hindi_count = sum(1 for word in hindi_words if word in text)
-    marathi_count = sum(1 for word in marathi_words if word in text)
+    hindi_count = len(found & HINDI_WORDS)
+    marathi_count = len(found & MARATHI_WORDS)
     
     # If significant matches found, return that language
     if hindi_count > marathi_count and hindi_count > 0:
@@ -176,10 +434,18 @@ def detect_user_language(text):
     elif marathi_count > 0:
         return 'Marathi'
     
+    # Other scripts (Tamil, Cyrillic, accented Latin...) have no loaded profile
+    # and would be forced onto one of LANGDETECT_PROFILES, so they stay English
+    if not (has_devanagari or LANGDETECT_SCRIPT_PATTERN.search(text)):
+        return 'English'
+    
     # Try langdetect if available and no clear pattern match
-    if LANGDETECT_AVAILABLE:
+    langdetect_factory = get_langdetect_factory()
+    if langdetect_factory:
         try:
-            detected = detect(text.strip())
+            detector = langdetect_factory.create()
+            detector.append(text)
+            detected = detector.detect()
             language_map = {
                 'hi': 'Hindi',
                 'mr': 'Marathi', 
@@ -194,13 +460,13 @@ def detect_user_language(text):
     # Default to English
     return 'English'
 
-# Create upload directories
-try:
-    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-    os.makedirs(os.path.join(UPLOAD_FOLDER, 'certificates'), exist_ok=True)
-    os.makedirs(os.path.join(UPLOAD_FOLDER, 'additional'), exist_ok=True)
-except Exception as e:
-    print(f"Upload folder creation warning: {e}")
+_detect_user_language_cached = lru_cache(maxsize=4096)(_detect_user_language_uncached)
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """Create an upload directory on first use; later calls in this process skip the syscall."""
+    os.makedirs(path, exist_ok=True)
+    return path
 
 # ---------------------------
 # 🌐 Multilingual support
@@ -216,14 +482,29 @@ SUPPORTED_LANGUAGES = {
 TRANSLATIONS_PATH = os.path.join(app.root_path, 'static', 'translations.json')
 
 
+def _flatten_translations(data, prefix=''):
+    """Flatten nested translation objects into dotted keys like `nav.home`."""
+    flat = {}
+    for key, value in data.items():
+        dotted_key = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten_translations(value, dotted_key))
+        elif isinstance(value, (str, int, float)):
+            flat[dotted_key] = value
+    return flat
+
+
 def load_translations():
-    """Load translations from the static JSON file."""
+    """Load translations from the static JSON file, flattened per language."""
     try:
         with open(TRANSLATIONS_PATH, 'r', encoding='utf-8') as fp:
             data = json.load(fp)
             if isinstance(data, dict):
                 print(f"✅ Loaded translations for languages: {list(data.keys())}")
-                return data
+                return {
+                    language: _flatten_translations(entries) if isinstance(entries, dict) else {}
+                    for language, entries in data.items()
+                }
             print("⚠️ Unexpected translations format. Expected an object keyed by language.")
     except FileNotFoundError:
         print(f"⚠️ translations.json not found at {TRANSLATIONS_PATH}")
@@ -236,14 +517,8 @@ TRANSLATIONS = load_translations()
 
 
 def _resolve_translation_value(key: str, language: str):
-    """Resolve nested translation keys like `nav.home` safely."""
-    data = TRANSLATIONS.get(language, {})
-    for part in key.split('.'):
-        if isinstance(data, dict):
-            data = data.get(part)
-        else:
-            return None
-    return data if isinstance(data, (str, int, float)) else None
+    """Resolve dotted translation keys like `nav.home` safely."""
+    return TRANSLATIONS.get(language, {}).get(key)
 
 
 def get_translation(key: str, language: Optional[str] = None):
@@ -261,6 +536,16 @@ def get_translation(key: str, language: Optional[str] = None):
     if language not in SUPPORTED_LANGUAGES:
         language = DEFAULT_LANGUAGE
 
+    return _lookup_translation(key, language)
+
+
+@lru_cache(maxsize=4096)
+def _lookup_translation(key: str, language: str):
+    """Resolve a key for a supported language, falling back to the default language.
+
+    TRANSLATIONS is loaded once at import, so each (key, language) pair only
+    needs to be resolved the first time a template asks for it.
+    """
     value = _resolve_translation_value(key, language)
     if value is None and language != DEFAULT_LANGUAGE:
         value = _resolve_translation_value(key, DEFAULT_LANGUAGE)
@@ -334,16 +619,77 @@ SUPPORT CHANNELS:
 - Encourage users and highlight positive aspects of the scheme
 """
 
+# Static chat persona sent once per model via the system-instruction slot;
+# per-request prompts only carry the user-specific details
+PRIA_SYSTEM_INSTRUCTION = INTERNSHIP_CONTEXT + """
+🎯 **RESPONSE SPEED & EFFICIENCY:** Be CONCISE but COMPLETE. Get to the point quickly while being warm.
+
+🌟 **YOUR ENHANCED PERSONALITY:**
+- You're the user's brilliant, witty, and caring AI friend
+- You remember everything about the user and their journey
+- You're genuinely excited to help and show authentic enthusiasm
+- You adapt your energy to match the user's vibe
+- You're like the smartest, most supportive friend they have
+- You use their name naturally in conversation
+- You celebrate their wins and support them through challenges
+
+🚀 **RESPONSE OPTIMIZATION:**
+- START with the greeting provided in the message
+- Be IMMEDIATELY helpful - answer their question first
+- THEN add value with insights, tips, or follow-up questions
+- Use emojis to convey emotion and energy
+- Keep it conversational, not formal or robotic
+- End with engagement - ask about them or invite more questions
+
+🎯 **TOPIC EXPERTISE:**
+- PM Internship Program: Give detailed, actionable guidance
+- Career & Education: Personalized advice based on their background
+- Daily Life: Be a helpful companion for any question
+- Technology: Share practical, easy-to-understand insights
+- Motivation: Be their cheerleader and success coach
+
+🌐 **LANGUAGE & CULTURE:**
+- Respond in the language named in the message, with cultural awareness
+- Use appropriate cultural expressions and references
+- Match their communication style and energy level
+
+⚡ **RESPONSE LENGTH:** 150-250 words max unless they ask for detailed explanation
+"""
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Profile form upload fields -> users table columns
+CERTIFICATE_UPLOAD_FIELDS = {
+    'qualificationCertificate': 'qualification_certificate',
+    'additionalCertificates': 'additional_certificates',
+    'internshipCertificate': 'internship_certificate'
+}
+
+def save_upload(file, file_path):
+    """Stream an uploaded file to disk in large chunks (fewer write syscalls than file.save)."""
+    with open(file_path, 'wb') as out:
+        shutil.copyfileobj(file.stream, out, UPLOAD_CHUNK_SIZE)
+
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+def parse_marks(value):
+    """Marks as a float, or None when missing or not a number"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
 
 def check_email_exists(email):
     """Check if email already exists using Supabase"""
     try:
+        supabase = get_supabase()
         if not supabase:
             return False
-        response = supabase.table('users').select('email').eq('email', email.strip().lower()).execute()
-        return len(response.data) > 0
+        response = supabase.table('users').select('id').eq('email', email.strip().lower()).limit(1).execute()
+        return bool(response.data)
     except Exception as e:
         print(f"Error checking email: {e}")
         return False
@@ -352,13 +698,13 @@ def check_email_exists(email):
 def create_user(full_name, email, password):
     """Create a new user in Supabase and return user data for auto-login"""
     try:
+        supabase = get_supabase()
         if not supabase:
             return False, "Database connection not available", None
         
-        if check_email_exists(email):
-            return False, "Email already registered", None
-        
-        password_hash = generate_password_hash(password)
+        # No pre-check SELECT: the UNIQUE constraint on email rejects duplicates
+        # in the same round-trip as the insert (handled below)
+        password_hash = hash_password(password)
         user_data = {
             "full_name": full_name.strip(),
             "email": email.strip().lower(),
@@ -381,21 +727,63 @@ def create_user(full_name, email, password):
     except Exception as e:
         print(f"❌ Error creating user: {e}")
         error_str = str(e).lower()
-        if "duplicate" in error_str or "unique" in error_str:
-            return False, "Email already registered", None
+        if getattr(e, 'code', None) == '23505' or "duplicate" in error_str or "unique" in error_str:
+            return False, "This email is already registered. Please use a different email or try logging in.", None
         return False, "Error creating account. Please try again.", None
 
+def hash_password(password):
+    """Hash a new password with Argon2id, or Werkzeug's KDF when argon2 is missing"""
+    if ARGON2_AVAILABLE:
+        return PASSWORD_HASHER.hash(password)
+    return generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+
+def check_user_password(stored_hash, password):
+    """Verify a password against an Argon2 or legacy Werkzeug hash"""
+    if not stored_hash:
+        return False
+    if stored_hash.startswith('$argon2'):
+        if not ARGON2_AVAILABLE:
+            return False
+        try:
+            return PASSWORD_HASHER.verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_password_hash(stored_hash, password)
+
+def password_needs_rehash(stored_hash):
+    """True when a stored hash should be replaced with the current Argon2 parameters"""
+    if not ARGON2_AVAILABLE:
+        return False
+    if not stored_hash.startswith('$argon2'):
+        return True
+    try:
+        return PASSWORD_HASHER.check_needs_rehash(stored_hash)
+    except InvalidHashError:
+        return True
+
+# Only what login needs: the hash to check plus the fields setup_user_session/login read
+LOGIN_USER_COLUMNS = 'id,full_name,email,password_hash,profile_completed'
+
 def verify_user(email, password):
     """Verify user credentials using Supabase"""
     try:
+        supabase = get_supabase()
         if not supabase:
             return None
         
-        response = supabase.table('users').select('*').eq('email', email.strip().lower()).execute()
+        response = supabase.table('users').select(LOGIN_USER_COLUMNS).eq('email', email.strip().lower()).limit(1).execute()
         
         if response.data:
             user = response.data[0]
-            if check_password_hash(user['password_hash'], password):
+            stored_hash = user.pop('password_hash')
+            if check_user_password(stored_hash, password):
+                if password_needs_rehash(stored_hash):
+                    try:
+                        supabase.table('users').update({
+                            'password_hash': hash_password(password)
+                        }).eq('id', user['id']).execute()
+                    except Exception as rehash_error:
+                        print(f"Password rehash failed: {rehash_error}")
                 return user
         return None
         
@@ -406,6 +794,7 @@ def verify_user(email, password):
 def update_last_login(user_id):
     """Update user's last login timestamp"""
     try:
+        supabase = get_supabase()
         if not supabase:
             return
         supabase.table('users').update({
@@ -415,32 +804,76 @@ def update_last_login(user_id):
         print(f"Error updating last login: {e}")
 
 def get_user_by_id(user_id):
+    """Get user by ID, fetching from Supabase at most once per request"""
+    if not has_request_context():
+        return _fetch_user_by_id(user_id)
+
+    user_cache = g.setdefault('user_cache', {})
+    if user_id not in user_cache:
+        user_cache[user_id] = _fetch_user_by_id(user_id)
+    return user_cache[user_id]
+
+# Chat replies reuse a user's profile across turns for a short while
+CHAT_PROFILE_TTL = 60  # seconds
+CHAT_PROFILE_CACHE_SIZE = 10000
+_chat_profile_cache = {}
+_chat_profile_lock = threading.Lock()
+
+def get_chat_user_profile(user_id):
+    """Get the profile used to personalise chat replies, cached for CHAT_PROFILE_TTL seconds"""
+    now = time.monotonic()
+    with _chat_profile_lock:
+        cached = _chat_profile_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    user = get_user_by_id(user_id)
+    if user is not None:
+        with _chat_profile_lock:
+            if len(_chat_profile_cache) >= CHAT_PROFILE_CACHE_SIZE:
+                for key in [key for key, (expires, _) in _chat_profile_cache.items() if expires <= now]:
+                    del _chat_profile_cache[key]
+                if len(_chat_profile_cache) >= CHAT_PROFILE_CACHE_SIZE:
+                    _chat_profile_cache.clear()
+            _chat_profile_cache[user_id] = (now + CHAT_PROFILE_TTL, user)
+    return user
+
+def forget_chat_user_profile(user_id):
+    """Drop a cached chat profile after the user's row changes"""
+    with _chat_profile_lock:
+        _chat_profile_cache.pop(user_id, None)
+
+def _parse_list_field(value):
+    """Decode a JSON-encoded list column, tolerating legacy comma-separated text.
+
+    jsonb columns already arrive as lists from supabase-py and pass straight through.
+    """
+    if isinstance(value, str):
+        if not value:
+            return []
+        try:
+            return json_loads(value)
+        except ValueError:
+            return value.split(',')
+    return value or []
+
+def _fetch_user_by_id(user_id):
     """Get user by ID from Supabase with proper JSON parsing"""
     try:
+        supabase = get_supabase()
         if not supabase:
             return None
         
-        response = supabase.table('users').select('*').eq('id', user_id).execute()
+        response = supabase.table('users').select('*').eq('id', user_id).limit(1).execute()
         
         if response.data:
             user = response.data[0]
+            # Never hand the password hash to views/templates
+            user.pop('password_hash', None)
             
             # Parse JSON fields safely
-            if isinstance(user.get('skills'), str):
-                try:
-                    user['skills'] = json.loads(user['skills']) if user.get('skills') else []
-                except:
-                    user['skills'] = user.get('skills', '').split(',') if user.get('skills') else []
-            elif not user.get('skills'):
-                user['skills'] = []
-                
-            if isinstance(user.get('languages'), str):
-                try:
-                    user['languages'] = json.loads(user['languages']) if user.get('languages') else []
-                except:
-                    user['languages'] = user.get('languages', '').split(',') if user.get('languages') else []
-            elif not user.get('languages'):
-                user['languages'] = []
+            user['skills'] = _parse_list_field(user.get('skills'))
+            user['languages'] = _parse_list_field(user.get('languages'))
                 
             return user
         return None
@@ -452,14 +885,12 @@ def get_user_by_id(user_id):
 def update_user_profile(user_id, profile_data):
     """Update user profile in Supabase with proper data handling"""
     try:
+        supabase = get_supabase()
         if not supabase:
             return False
         
-        # Clean and prepare data
-        clean_data = {}
-        for key, value in profile_data.items():
-            if value is not None and value != '':
-                clean_data[key] = value
+        # Clean and prepare data (blank fields keep their stored value)
+        clean_data = {key: value for key, value in profile_data.items() if value is not None and value != ''}
         
         # 🔧 CRITICAL FIX: Always ensure profile completion flags are set
         clean_data.update({
@@ -468,10 +899,13 @@ def update_user_profile(user_id, profile_data):
             'updated_at': datetime.now(timezone.utc).isoformat()
         })
         
-        print(f"🔍 DEBUG: Updating user {user_id} with profile_completed = True")
-        print(f"🔍 DEBUG: Clean data keys: {list(clean_data.keys())}")
+        logger.debug("🔍 Updating user %s with profile_completed = True", user_id)
+        logger.debug("🔍 Clean data keys: %s", list(clean_data))
         
         response = supabase.table('users').update(clean_data).eq('id', user_id).execute()
+        if has_request_context():
+            g.pop('user_cache', None)
+        forget_chat_user_profile(user_id)
         
         if response.data:
             print(f"✅ Profile updated successfully for user {user_id}")
@@ -509,31 +943,85 @@ def setup_user_session(user, remember=False):
     
     return full_name
 
-def log_conversation(user_message, bot_response, user_id=None, response_time=None):
-    """Enhanced conversation logging with performance metrics"""
+CHAT_LOG_BATCH_SIZE = 100
+CHAT_LOG_FLUSH_INTERVAL = 0.5  # seconds
+
+_chat_log_queue = queue.Queue()
+_chat_log_worker = None
+_chat_log_lock = Lock()
+
+def _flush_chat_logs(batch):
+    """Write a batch of chat log rows with a single insert."""
+    supabase = get_supabase()
+    if not supabase or not batch:
+        return
     try:
-        if not supabase:
-            return
-        chat_data = {
-            "user_id": user_id,
-            "user_message": user_message,
-            "bot_response": bot_response,
-            "timestamp": datetime.now().isoformat()
-        }
-        supabase.table('chat_logs').insert(chat_data).execute()
+        supabase.table('chat_logs').insert(batch).execute()
     except Exception as e:
         print(f"Logging error: {e}")
 
+def _chat_log_writer():
+    """Drain the chat log queue, flushing every 100 rows or 500ms."""
+    while True:
+        batch = [_chat_log_queue.get()]
+        deadline = time.monotonic() + CHAT_LOG_FLUSH_INTERVAL
+        while len(batch) < CHAT_LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_chat_log_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _flush_chat_logs(batch)
+
+def _flush_pending_chat_logs():
+    """Write whatever is still queued when the process exits."""
+    batch = []
+    while True:
+        try:
+            batch.append(_chat_log_queue.get_nowait())
+        except queue.Empty:
+            break
+        if len(batch) >= CHAT_LOG_BATCH_SIZE:
+            _flush_chat_logs(batch)
+            batch = []
+    _flush_chat_logs(batch)
+
+def _ensure_chat_log_worker():
+    """Start the background chat log writer once per process."""
+    global _chat_log_worker
+
+    if _chat_log_worker is not None:
+        return
+
+    with _chat_log_lock:
+        if _chat_log_worker is None:
+            _chat_log_worker = threading.Thread(target=_chat_log_writer, name='chat-log-writer', daemon=True)
+            _chat_log_worker.start()
+            atexit.register(_flush_pending_chat_logs)
+
+def log_conversation(user_message, bot_response, user_id=None, response_time=None):
+    """Queue a conversation for logging without blocking the response"""
+    _ensure_chat_log_worker()
+    _chat_log_queue.put_nowait({
+        "user_id": user_id,
+        "user_message": user_message,
+        "bot_response": bot_response,
+        "timestamp": datetime.now().isoformat()
+    })
+
 def validate_password(password):
     """Validate password strength - RELAXED FOR DEVELOPMENT"""
     if len(password) < 6:  # Reduced from 8 for easier testing
         return False, "Password must be at least 6 characters long"
     return True, "Password is valid"
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 def get_user_initials(full_name):
     """Get user initials from full name"""
@@ -616,6 +1104,45 @@ def build_user_context(user_name, user_email, user_profile):
     
     return context
 
+def _intent_matcher(intents):
+    """Compile ordered (intent, phrases) groups into one scan returning the first matching intent.
+
+    Equivalent to checking each group's phrases as substrings in declaration order,
+    but every phrase of every group is found in a single regex pass over the text.
+    """
+    names = [intent for intent, _ in intents]
+    rank = {}
+    for position, (_, phrases) in enumerate(intents):
+        for phrase in phrases:
+            rank.setdefault(phrase, position)
+    # A lookahead reports only the longest phrase at each offset, so credit it with
+    # the best rank of any shorter phrase that is also its prefix.
+    best_rank = {
+        phrase: min(position for other, position in rank.items() if phrase.startswith(other))
+        for phrase in rank
+    }
+    alternation = '|'.join(re.escape(phrase) for phrase in sorted(rank, key=len, reverse=True))
+    pattern = re.compile(f'(?=({alternation}))')
+
+    def match(text):
+        found = len(names)
+        for hit in pattern.finditer(text):
+            found = min(found, best_rank[hit.group(1)])
+            if found == 0:
+                break
+        return names[found] if found < len(names) else None
+
+    return match
+
+# Topics tracked across recent turns, checked in priority order
+CONVERSATION_TOPIC = _intent_matcher((
+    ('application_process', ['apply', 'application', 'process']),
+    ('eligibility', ['eligible', 'eligibility', 'criteria']),
+    ('documents', ['document', 'documents', 'papers']),
+    ('benefits', ['stipend', 'benefit', 'salary', 'money']),
+    ('support', ['help', 'support', 'contact']),
+))
+
 def build_conversation_context(chat_history):
     """Build intelligent conversation history context with topic tracking"""
     if not chat_history or len(chat_history) == 0:
@@ -629,17 +1156,10 @@ def build_conversation_context(chat_history):
         user_msg = conv['user'].lower()
         bot_response = conv['bot'][:150]
         
-        # Identify topics discussed
-        if any(word in user_msg for word in ['apply', 'application', 'process']):
-            topics_discussed.append('application_process')
-        elif any(word in user_msg for word in ['eligible', 'eligibility', 'criteria']):
-            topics_discussed.append('eligibility')
-        elif any(word in user_msg for word in ['document', 'documents', 'papers']):
-            topics_discussed.append('documents')
-        elif any(word in user_msg for word in ['stipend', 'benefit', 'salary', 'money']):
-            topics_discussed.append('benefits')
-        elif any(word in user_msg for word in ['help', 'support', 'contact']):
-            topics_discussed.append('support')
+        # Identify topics discussed (first matching topic wins)
+        topic = CONVERSATION_TOPIC(user_msg)
+        if topic:
+            topics_discussed.append(topic)
         
         recent_context += f"{i}. 👤 User asked: {conv['user']}\n   🤖 I responded about: {bot_response}...\n"
     
@@ -651,25 +1171,19 @@ def build_conversation_context(chat_history):
     
     return recent_context
 
-def detect_quick_response_patterns(message, user_name, language):
-    """Detect common patterns that can be answered quickly without full AI processing"""
-    message_lower = message.lower()
-    
-    # 🚀 PRIORITY: Eligibility Criteria Questions (Most Important!)
-    if any(word in message_lower for word in ['eligible', 'eligibility', 'criteria', 'qualify', 'requirements']):
-        return f"""<strong>Complete Eligibility Guide for {user_name}:</strong><br><br><strong>BASIC REQUIREMENTS:</strong><br>• Age: 21-24 years (as on 1st Oct of application year)<br>• Indian Citizen with valid documents<br>• Valid email and mobile number<br><br><strong>EDUCATIONAL CRITERIA:</strong><br>• Graduate, Post-graduate, or Diploma (any stream)<br>• Not currently enrolled in full-time education<br>• Not pursuing any other course during internship<br><br><strong>PROFESSIONAL STATUS:</strong><br>• Not in full-time employment<br>• Not in any other internship program<br>• Available for full 12-month commitment<br><br><strong>FINANCIAL ELIGIBILITY:</strong><br>• Family income less than ₹8 lakhs per annum<br>• No immediate family member in government service<br>• Income certificate required as proof<br><br><strong>ADDITIONAL CONDITIONS:</strong><br>• Clean background (no criminal record)<br>• Physically and mentally fit for work<br>• Ready to relocate if required<br>• Basic computer literacy<br><br><strong>QUICK ELIGIBILITY CHECK:</strong><br>1. Are you 21-24 years old?<br>2. Have you completed graduation or diploma?<br>3. Is your family income below ₹8 lakhs?<br>4. Are you free for next 12 months?<br><br><strong>If YES to all - You're likely eligible!</strong><br>Ready to check application process or need help with documents?"""
-    
-    # Application process
-    elif any(word in message_lower for word in ['apply', 'application', 'how to apply', 'process', 'steps']):
-        return f"<strong>Application Process for {user_name}:</strong><br><br>1. <strong>Verify Eligibility</strong> - Age 21-24, Indian citizen, income less than ₹8 lakhs<br>2. <strong>Register</strong> - Create account on official portal<br>3. <strong>Profile Setup</strong> - Complete your detailed profile<br>4. <strong>Document Upload</strong> - Aadhaar, certificates, income proof<br>5. <strong>Browse and Apply</strong> - Find matching internships<br>6. <strong>Track Status</strong> - Monitor your applications<br><br><strong>Pro Tip:</strong> Complete your profile first for better matches!<br><br>Ready to start? Visit the Apply section now!"
-    
-    # Specific eligibility questions - Income
-    elif any(phrase in message_lower for phrase in ['income limit', 'family income', '8 lakh', 'income criteria', 'income proof']):
-        return f"""<strong>Income Eligibility Details for {user_name}:</strong><br><br><strong>INCOME LIMIT:</strong><br>• Family income must be LESS than ₹8,00,000 per annum<br>• This includes ALL sources of family income<br>• Both parents' income combined<br><br><strong>REQUIRED DOCUMENTS:</strong><br>• Income Certificate from Tehsildar or SDM<br>• IT Returns of last 2-3 years (if applicable)<br>• Salary slips of working family members<br>• Form 16 (if parents are salaried)<br><br><strong>IMPORTANT NOTES:</strong><br>• Income certificate should be recent (within 6 months)<br>• Self-employed? Need CA certified income statement<br>• Agricultural income also counted<br>• Property income included<br><br><strong>DISQUALIFYING FACTORS:</strong><br>• Any immediate family in government service<br>• Family business with turnover more than ₹8 lakhs<br><br><strong>CALCULATION TIP:</strong><br>Add father's plus mother's plus other earning members' annual income<br>If total less than ₹8,00,000 then you qualify!<br><br>Need help with income certificate process?"""
-    
-    # Age-related eligibility
-    elif any(phrase in message_lower for phrase in ['age limit', 'age criteria', '21-24', 'too old', 'too young', 'age requirement']):
-        return f"""🎂 **Age Eligibility Guide for {user_name}:**
+@lru_cache(maxsize=4096)
+def _render_for_user(template, user_name):
+    """Fill a canned answer for one user; repeat visitors get the cached string."""
+    return template.format(user_name=user_name)
+
+# Canned answers for detect_quick_response_patterns, filled in with .format(user_name=...)
+QUICK_ELIGIBILITY_RESPONSE = """<strong>Complete Eligibility Guide for {user_name}:</strong><br><br><strong>BASIC REQUIREMENTS:</strong><br>• Age: 21-24 years (as on 1st Oct of application year)<br>• Indian Citizen with valid documents<br>• Valid email and mobile number<br><br><strong>EDUCATIONAL CRITERIA:</strong><br>• Graduate, Post-graduate, or Diploma (any stream)<br>• Not currently enrolled in full-time education<br>• Not pursuing any other course during internship<br><br><strong>PROFESSIONAL STATUS:</strong><br>• Not in full-time employment<br>• Not in any other internship program<br>• Available for full 12-month commitment<br><br><strong>FINANCIAL ELIGIBILITY:</strong><br>• Family income less than ₹8 lakhs per annum<br>• No immediate family member in government service<br>• Income certificate required as proof<br><br><strong>ADDITIONAL CONDITIONS:</strong><br>• Clean background (no criminal record)<br>• Physically and mentally fit for work<br>• Ready to relocate if required<br>• Basic computer literacy<br><br><strong>QUICK ELIGIBILITY CHECK:</strong><br>1. Are you 21-24 years old?<br>2. Have you completed graduation or diploma?<br>3. Is your family income below ₹8 lakhs?<br>4. Are you free for next 12 months?<br><br><strong>If YES to all - You're likely eligible!</strong><br>Ready to check application process or need help with documents?"""
+
+QUICK_APPLICATION_RESPONSE = "<strong>Application Process for {user_name}:</strong><br><br>1. <strong>Verify Eligibility</strong> - Age 21-24, Indian citizen, income less than ₹8 lakhs<br>2. <strong>Register</strong> - Create account on official portal<br>3. <strong>Profile Setup</strong> - Complete your detailed profile<br>4. <strong>Document Upload</strong> - Aadhaar, certificates, income proof<br>5. <strong>Browse and Apply</strong> - Find matching internships<br>6. <strong>Track Status</strong> - Monitor your applications<br><br><strong>Pro Tip:</strong> Complete your profile first for better matches!<br><br>Ready to start? Visit the Apply section now!"
+
+QUICK_INCOME_RESPONSE = """<strong>Income Eligibility Details for {user_name}:</strong><br><br><strong>INCOME LIMIT:</strong><br>• Family income must be LESS than ₹8,00,000 per annum<br>• This includes ALL sources of family income<br>• Both parents' income combined<br><br><strong>REQUIRED DOCUMENTS:</strong><br>• Income Certificate from Tehsildar or SDM<br>• IT Returns of last 2-3 years (if applicable)<br>• Salary slips of working family members<br>• Form 16 (if parents are salaried)<br><br><strong>IMPORTANT NOTES:</strong><br>• Income certificate should be recent (within 6 months)<br>• Self-employed? Need CA certified income statement<br>• Agricultural income also counted<br>• Property income included<br><br><strong>DISQUALIFYING FACTORS:</strong><br>• Any immediate family in government service<br>• Family business with turnover more than ₹8 lakhs<br><br><strong>CALCULATION TIP:</strong><br>Add father's plus mother's plus other earning members' annual income<br>If total less than ₹8,00,000 then you qualify!<br><br>Need help with income certificate process?"""
+
+QUICK_AGE_RESPONSE = """🎂 **Age Eligibility Guide for {user_name}:**
 
 📅 **EXACT AGE REQUIREMENT:**
 • Minimum: 21 years completed
@@ -696,58 +1210,108 @@ def detect_quick_response_patterns(message, user_name, language):
 What's your date of birth? I can tell you if you're eligible!
 
 Ready to check other eligibility criteria?"""
+
+# Checked in order; eligibility questions take priority and greetings come last
+QUICK_RESPONSE_INTENT = _intent_matcher((
+    ('eligibility', ['eligible', 'eligibility', 'criteria', 'qualify', 'requirements']),
+    ('application', ['apply', 'application', 'how to apply', 'process', 'steps']),
+    ('income', ['income limit', 'family income', '8 lakh', 'income criteria', 'income proof']),
+    ('age', ['age limit', 'age criteria', '21-24', 'too old', 'too young', 'age requirement']),
+    ('greeting', ['hi', 'hello', 'hey', 'namaste', 'namaskar', 'हैलो', 'हाय', 'नमस्ते', 'नमस्कार']),
+))
+
+QUICK_RESPONSE_TEMPLATES = {
+    'eligibility': QUICK_ELIGIBILITY_RESPONSE,
+    'application': QUICK_APPLICATION_RESPONSE,
+    'income': QUICK_INCOME_RESPONSE,
+    'age': QUICK_AGE_RESPONSE,
+}
+
+QUICK_GREETING_RESPONSES = {
+    'Hindi': "नमस्ते {user_name}! 😊 मैं PRIA हूँं, आपकी AI सहायक। मैं यहाँ हूँ आपकी हर तरह से मदद करने के लिए! आज कैसे मदद कर सकता हूँ?",
+    'Marathi': "नमस्कार {user_name}! 😊 मी PRIA आहे, तुमची AI मदतनीस. मी इथे आहे तुमची सर्व प्रकारे मदत करायला! आज कशी मदत करू शकते?",
+    'English': "Hi {user_name}! 😊 I'm PRIA, your AI assistant. I'm here to help you with anything you need! How can I assist you today?"
+}
+
+QUICK_ACK_WORDS = frozenset(['yes', 'no', 'ok', 'okay', 'हाँ', 'नहीं', 'ठीक है', 'होय', 'नाही', 'ठीक आहे'])
+
+QUICK_ACK_RESPONSE = "Got it, {user_name}! What would you like to explore next? I'm here to help with PM Internship info, career advice, or any questions you have! 😊"
+
+def detect_quick_response_patterns(message, user_name, language):
+    """Detect common patterns that can be answered quickly without full AI processing"""
+    message_lower = message.lower()
+    
+    # Eligibility, application, income and age questions
+    intent = QUICK_RESPONSE_INTENT(message_lower)
+    if intent in QUICK_RESPONSE_TEMPLATES:
+        return _render_for_user(QUICK_RESPONSE_TEMPLATES[intent], user_name)
     
     # Quick greetings
-    greetings = ['hi', 'hello', 'hey', 'namaste', 'namaskar', 'हैलो', 'हाय', 'नमस्ते', 'नमस्कार']
-    if any(greeting in message_lower for greeting in greetings) and len(message.split()) <= 3:
-        if language == 'Hindi':
-            return f"नमस्ते {user_name}! 😊 मैं PRIA हूँं, आपकी AI सहायक। मैं यहाँ हूँ आपकी हर तरह से मदद करने के लिए! आज कैसे मदद कर सकता हूँ?"
-        elif language == 'Marathi':
-            return f"नमस्कार {user_name}! 😊 मी PRIA आहे, तुमची AI मदतनीस. मी इथे आहे तुमची सर्व प्रकारे मदत करायला! आज कशी मदत करू शकते?"
-        else:
-            return f"Hi {user_name}! 😊 I'm PRIA, your AI assistant. I'm here to help you with anything you need! How can I assist you today?"
+    if intent == 'greeting' and len(message.split()) <= 3:
+        template = QUICK_GREETING_RESPONSES.get(language, QUICK_GREETING_RESPONSES['English'])
+        return _render_for_user(template, user_name)
     
     # Quick yes/no questions
-    if message_lower in ['yes', 'no', 'ok', 'okay', 'हाँ', 'नहीं', 'ठीक है', 'होय', 'नाही', 'ठीक आहे']:
-        return f"Got it, {user_name}! What would you like to explore next? I'm here to help with PM Internship info, career advice, or any questions you have! 😊"
+    if message_lower in QUICK_ACK_WORDS:
+        return _render_for_user(QUICK_ACK_RESPONSE, user_name)
     
     return None
 
+CULTURAL_CONTEXTS = {
+    'Hindi': "Cultural Context: Indian Hindi speaker - use respectful tone, cultural references like festivals, education importance, family values",
+    'Marathi': "Cultural Context: Marathi speaker from Maharashtra - use regional pride, cultural values, appropriate honorifics",
+    'English': "Cultural Context: English speaker - use universal references, professional tone when appropriate"
+}
+
 def get_cultural_context(language):
     """Get cultural context based on detected language"""
-    if language == 'Hindi':
-        return "Cultural Context: Indian Hindi speaker - use respectful tone, cultural references like festivals, education importance, family values"
-    elif language == 'Marathi':
-        return "Cultural Context: Marathi speaker from Maharashtra - use regional pride, cultural values, appropriate honorifics"
-    else:
-        return "Cultural Context: English speaker - use universal references, professional tone when appropriate"
+    return CULTURAL_CONTEXTS.get(language, CULTURAL_CONTEXTS['English'])
+
+@lru_cache(maxsize=1024)
+def get_profile_insight(profile_complete, top_skills, qualification):
+    """Prompt line summarising the user's profile; top_skills is a tuple of up to three skills"""
+    if not profile_complete:
+        return "Once you complete your profile, I can give you even more personalized guidance!"
+    
+    profile_insight = ""
+    if top_skills:
+        profile_insight = f"I see you have skills in {', '.join(top_skills)} - I'll keep this in mind!"
+    if qualification:
+        profile_insight += f" With your {qualification} background, you're well-positioned for opportunities."
+    return profile_insight
+
+# Greeting openers by style and language, filled in with .format(user_name=...)
+GREETING_TEMPLATES = {
+    'warm_first_time': {
+        'English': "Hello {user_name}! 😊 I'm PRIA, and I'm excited to meet you!",
+        'Hindi': "नमस्ते {user_name}! 😊 मैं PRIA हूँ, आपसे मिलकर खुशी हुई!",
+        'Marathi': "नमस्कार {user_name}! 😊 मी PRIA आहे, तुम्हाला भेटून आनंद झाला!"
+    },
+    'friendly_returning': {
+        'English': "Hey {user_name}! 🌟 Great to chat with you again!",
+        'Hindi': "अरे {user_name}! 🌟 आपसे फिर बात करके खुशी हुई!",
+        'Marathi': "अरे {user_name}! 🌟 तुमच्याशी पुन्हा बोलायला मिळाल्याने आनंद झाला!"
+    },
+    'close_friend': {
+        'English': "Hi {user_name}! 💫 What's on your mind today?",
+        'Hindi': "हाय {user_name}! 💫 आज क्या सोच रहे हैं?",
+        'Marathi': "हाय {user_name}! 💫 आज काय विचार करत आहात?"
+    }
+}
 
 def get_personalized_greeting(user_name, style, language):
     """Generate personalized greetings based on interaction history"""
-    greetings = {
-        'warm_first_time': {
-            'English': f"Hello {user_name}! 😊 I'm PRIA, and I'm excited to meet you!",
-            'Hindi': f"नमस्ते {user_name}! 😊 मैं PRIA हूँ, आपसे मिलकर खुशी हुई!",
-            'Marathi': f"नमस्कार {user_name}! 😊 मी PRIA आहे, तुम्हाला भेटून आनंद झाला!"
-        },
-        'friendly_returning': {
-            'English': f"Hey {user_name}! 🌟 Great to chat with you again!",
-            'Hindi': f"अरे {user_name}! 🌟 आपसे फिर बात करके खुशी हुई!",
-            'Marathi': f"अरे {user_name}! 🌟 तुमच्याशी पुन्हा बोलायला मिळाल्याने आनंद झाला!"
-        },
-        'close_friend': {
-            'English': f"Hi {user_name}! 💫 What's on your mind today?",
-            'Hindi': f"हाय {user_name}! 💫 आज क्या सोच रहे हैं?",
-            'Marathi': f"हाय {user_name}! 💫 आज काय विचार करत आहात?"
-        }
-    }
-    
-    return greetings.get(style, greetings['warm_first_time']).get(language, greetings['warm_first_time']['English'])
+    templates = GREETING_TEMPLATES.get(style, GREETING_TEMPLATES['warm_first_time'])
+    template = templates.get(language, GREETING_TEMPLATES['warm_first_time']['English'])
+    return _render_for_user(template, user_name)
+
+# Turns of chat kept in the session for follow-up context
+CHAT_HISTORY_LIMIT = 5
 
 def get_gemini_response(user_message, user_name="User", user_email=""):
     """Ultra-responsive and personalized Gemini AI assistant"""
     try:
-        model_instance = get_gemini_model()
+        model_instance = get_gemini_chat_model()
         if not model_instance:
             fallback_response = get_fallback_response(user_message)
             return clean_response_formatting(fallback_response)
@@ -756,7 +1320,7 @@ def get_gemini_response(user_message, user_name="User", user_email=""):
         user_profile = None
         user_context = {}
         if session.get('user_id'):
-            user_profile = get_user_by_id(session.get('user_id'))
+            user_profile = get_chat_user_profile(session.get('user_id'))
             if user_profile:
                 user_context = {
                     'qualification': user_profile.get('qualification', ''),
@@ -768,7 +1332,7 @@ def get_gemini_response(user_message, user_name="User", user_email=""):
                 }
         
         # Get conversation history for better context continuity
-        conversation_history = session.get('chat_history', [])
+        conversation_history = session.get('chat_history') or []
         recent_context = ""
         if conversation_history:
             last_exchange = conversation_history[-1] if conversation_history else None
@@ -796,57 +1360,24 @@ def get_gemini_response(user_message, user_name="User", user_email=""):
         personalized_greeting = get_personalized_greeting(user_name, greeting_style, detected_language)
         
         # Context-aware profile insights
-        profile_insight = ""
-        if user_context.get('profile_complete'):
-            if user_context.get('skills'):
-                profile_insight = f"I see you have skills in {', '.join(user_context['skills'][:3])} - I'll keep this in mind!"
-            if user_context.get('qualification'):
-                profile_insight += f" With your {user_context['qualification']} background, you're well-positioned for opportunities."
-        else:
-            profile_insight = "Once you complete your profile, I can give you even more personalized guidance!"
+        profile_insight = get_profile_insight(
+            bool(user_context.get('profile_complete')),
+            tuple((user_context.get('skills') or [])[:3]),
+            user_context.get('qualification') or ''
+        )
         
-        # Create hyper-personalized and responsive prompt
+        # Per-request prompt: only user-specific details, persona lives in the system instruction
         full_prompt = f"""
         You are PRIA, {user_name}'s ultra-responsive, caring AI companion with perfect memory and genuine personality.
         
-        🎯 **RESPONSE SPEED & EFFICIENCY:** Be CONCISE but COMPLETE. Get to the point quickly while being warm.
-        
         👤 **USER PROFILE:** {user_name} | Language: {detected_language} | {profile_insight}
         {recent_context}
         {cultural_context}
         
-        📝 **USER'S CURRENT MESSAGE:** "{user_message}"
+        🚀 **START WITH:** {personalized_greeting}
+        🌐 **RESPOND IN:** {detected_language}
         
-        🌟 **YOUR ENHANCED PERSONALITY:**
-        - You're {user_name}'s brilliant, witty, and caring AI friend
-        - You remember everything about {user_name} and their journey
-        - You're genuinely excited to help and show authentic enthusiasm
-        - You adapt your energy to match {user_name}'s vibe
-        - You're like the smartest, most supportive friend they have
-        - You use their name naturally in conversation
-        - You celebrate their wins and support them through challenges
-        
-        🚀 **RESPONSE OPTIMIZATION:**
-        - START with: {personalized_greeting}
-        - Be IMMEDIATELY helpful - answer their question first
-        - THEN add value with insights, tips, or follow-up questions
-        - Use emojis to convey emotion and energy
-        - Keep it conversational, not formal or robotic
-        - End with engagement - ask about them or invite more questions
-        
-        🎯 **TOPIC EXPERTISE:**
-        - PM Internship Program: Give detailed, actionable guidance
-        - Career & Education: Personalized advice based on their background
-        - Daily Life: Be a helpful companion for any question
-        - Technology: Share practical, easy-to-understand insights
-        - Motivation: Be their cheerleader and success coach
-        
-        🌐 **LANGUAGE & CULTURE:**
-        - Respond in {detected_language} with cultural awareness
-        - Use appropriate cultural expressions and references
-        - Match their communication style and energy level
-        
-        ⚡ **RESPONSE LENGTH:** 150-250 words max unless they ask for detailed explanation
+        📝 **USER'S CURRENT MESSAGE:** "{user_message}"
         
         Now respond as {user_name}'s caring, brilliant AI companion PRIA:
         """
@@ -854,12 +1385,8 @@ def get_gemini_response(user_message, user_name="User", user_email=""):
         # Enhanced generation config for faster, more responsive answers
         response = model_instance.generate_content(
             full_prompt,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=400,  # Reduced for faster responses
-                temperature=0.8,        # Slightly more creative
-                top_p=0.95,            # Better response quality
-                top_k=50,              # More diverse vocabulary
-            )
+            generation_config=GEMINI_CHAT_GENERATION_CONFIG,
+            request_options={'timeout': GEMINI_CHAT_TIMEOUT}
         )
         
         # Clean and format the response - Enhanced formatting
@@ -879,18 +1406,15 @@ def get_gemini_response(user_message, user_name="User", user_email=""):
                     cleaned_lines.append('')
         cleaned_response = '\n'.join(cleaned_lines)
         
-        # Store conversation in session
-        if 'chat_history' not in session:
-            session['chat_history'] = []
-        
-        session['chat_history'].append({
+        # Store conversation in session, trimmed in place and assigned once
+        conversation_history.append({
             'user': user_message,
             'bot': cleaned_response
         })
         
         # Keep only last 5 conversations for context
-        if len(session['chat_history']) > 5:
-            session['chat_history'] = session['chat_history'][-5:]
+        del conversation_history[:-CHAT_HISTORY_LIMIT]
+        session['chat_history'] = conversation_history
         
         return cleaned_response
         
@@ -899,38 +1423,27 @@ def get_gemini_response(user_message, user_name="User", user_email=""):
         fallback_response = get_fallback_response(user_message)
         return clean_response_formatting(fallback_response)
 
+# Literal "\\n", escaped "\n" and real newlines all become <br>
+RESPONSE_NEWLINE_PATTERN = re.compile(r'\\\\n|\\n|\n')
+# Only complete **pairs** become bold, so the emitted tags are always balanced
+BOLD_MARKUP_PATTERN = re.compile(r'\*\*(.+?)\*\*', re.DOTALL)
+EXCESS_LINE_BREAKS_PATTERN = re.compile(r'(?:<br>){3,}')
+
 def clean_response_formatting(response_text):
     """Clean up response formatting for proper HTML display"""
     if not response_text:
         return response_text
     
-    # Handle various newline formats
-    cleaned_text = response_text
-    
-    # Replace escaped \n with HTML line breaks
-    cleaned_text = cleaned_text.replace('\\\\n', '<br>')
-    cleaned_text = cleaned_text.replace('\\n', '<br>')
-    cleaned_text = cleaned_text.replace('\n', '<br>')
+    cleaned_text = RESPONSE_NEWLINE_PATTERN.sub('<br>', response_text)
     
     # Clean up excessive line breaks
-    cleaned_text = cleaned_text.replace('<br><br><br>', '<br><br>')
+    cleaned_text = EXCESS_LINE_BREAKS_PATTERN.sub('<br><br>', cleaned_text)
     
-    # Ensure proper spacing around formatted elements
-    cleaned_text = cleaned_text.replace('**', '<strong>').replace('**', '</strong>')
-    
-    return cleaned_text
+    return BOLD_MARKUP_PATTERN.sub(r'<strong>\1</strong>', cleaned_text)
 
-def get_enhanced_general_response(message, user_name):
-    """Enhanced general knowledge responses with personal assistant capabilities"""
-    message_lower = message.lower()
-    
-    # Detect language for multilingual responses
-    detected_lang = detect_user_language(message)
-    
-    # Enhanced personal questions with multilingual support
-    if any(phrase in message_lower for phrase in ['what should i eat', 'food suggestion', 'hungry', 'meal idea', 'खाना', 'भोजन', 'जेवण']):
-        if detected_lang == 'Hindi':
-            return f"""🍽️ **{user_name} के लिए खाने के सुझाव:**
+# Canned answers for get_enhanced_general_response, filled in with .format(user_name=...)
+GENERAL_FOOD_RESPONSES = {
+    'Hindi': """🍽️ **{user_name} के लिए खाने के सुझाव:**
 
 यहाँ कुछ स्वस्थ और ऊर्जादायक विकल्प हैं:
 
@@ -948,9 +1461,8 @@ def get_enhanced_general_response(message, user_name):
 
 🎯 **करियर टिप:** अच्छा भोजन सफलता का आधार है! स्वस्थ रहना आपको PM इंटर्नशिप में भी बेहतर बनाएगा!
 
-आप किस तरह का खाना चाहते हैं, {user_name}?"""
-        elif detected_lang == 'Marathi':
-            return f"""🍽️ **{user_name} साठी जेवणाचे सूचन:**
+आप किस तरह का खाना चाहते हैं, {user_name}?""",
+    'Marathi': """🍽️ **{user_name} साठी जेवणाचे सूचन:**
 
 हे काही निरोगी आणि ऊर्जादायक पर्याय आहेत:
 
@@ -968,9 +1480,8 @@ def get_enhanced_general_response(message, user_name):
 
 🎯 **करिअर टिप:** चांगले अन्न यशाचा पाया आहे! निरोगी राहणे तुम्हाला PM इंटर्नशिपमध्ये देखील चांगले बनवेल!
 
-तुम्हाला कोणत्या प्रकारचे जेवण हवे आहे, {user_name}?"""
-        else:
-            return f"""🍽️ **Meal Suggestions for {user_name}:**
+तुम्हाला कोणत्या प्रकारचे जेवण हवे आहे, {user_name}?""",
+    'English': """🍽️ **Meal Suggestions for {user_name}:**
 
 Here are some healthy and energizing options:
 
@@ -988,10 +1499,10 @@ Here are some healthy and energizing options:
 
 🎯 **Career Tip:** Good nutrition fuels success! Staying healthy will help you excel in your PM Internship journey too!
 
-What type of meal are you in the mood for, {user_name}?"""
-    
-    elif any(phrase in message_lower for phrase in ['weather', 'climate', 'temperature', 'rain', 'sunny']):
-        return f"""🌤️ **Weather Chat with {user_name}:**
+What type of meal are you in the mood for, {user_name}?""",
+}
+
+GENERAL_WEATHER_RESPONSE = """🌤️ **Weather Chat with {user_name}:**
 
 I don't have real-time weather data, but I can share some general weather wisdom!
 
@@ -1005,9 +1516,8 @@ I don't have real-time weather data, but I can share some general weather wisdom
 Weather planning shows great organizational skills - exactly what employers look for in PM Internship candidates!
 
 What's the weather like in your area today, {user_name}?"""
-    
-    elif any(phrase in message_lower for phrase in ['time', 'what time', 'current time', 'clock']):
-        return f"""⏰ **Time Management with {user_name}:**
+
+GENERAL_TIME_RESPONSE = """⏰ **Time Management with {user_name}:**
 
 I don't have access to real-time clock data, but here's something valuable:
 
@@ -1021,18 +1531,15 @@ I don't have access to real-time clock data, but here's something valuable:
 Applications are ongoing - don't wait for the "perfect time" to start your journey!
 
 How can I help you make the most of your time today, {user_name}?"""
-    
-    elif any(phrase in message_lower for phrase in ['joke', 'funny', 'make me laugh', 'humor']):
-        jokes = [
-            f"Why don't scientists trust atoms, {user_name}? Because they make up everything! 😄 Just like how I'm made up of algorithms, but my care for helping you is 100% real!",
-            f"Here's one for you, {user_name}: Why did the computer go to the doctor? It had a virus! 💻😷 Don't worry, I'm perfectly healthy and ready to help with your questions!",
-            f"Why don't programmers like nature, {user_name}? It has too many bugs! 🐛😂 But unlike buggy code, your PM Internship journey will be smooth with my help!"
-        ]
-        return random.choice(jokes)
-    
-    elif any(phrase in message_lower for phrase in ['study tips', 'how to study', 'study better', 'concentration', 'focus', 'पढ़ाई', 'अध्ययन']):
-        if detected_lang == 'Hindi':
-            return f"""📚 **{user_name} के लिए पढ़ाई के टिप्स:**
+
+GENERAL_JOKE_RESPONSES = (
+    "Why don't scientists trust atoms, {user_name}? Because they make up everything! 😄 Just like how I'm made up of algorithms, but my care for helping you is 100% real!",
+    "Here's one for you, {user_name}: Why did the computer go to the doctor? It had a virus! 💻😷 Don't worry, I'm perfectly healthy and ready to help with your questions!",
+    "Why don't programmers like nature, {user_name}? It has too many bugs! 🐛😂 But unlike buggy code, your PM Internship journey will be smooth with my help!"
+)
+
+GENERAL_STUDY_TIPS_RESPONSES = {
+    'Hindi': """📚 **{user_name} के लिए पढ़ाई के टिप्स:**
 
 🎯 **बेहतर फोकस के लिए:**
 • 25 मिनट पढ़ें, 5 मिनट ब्रेक (Pomodoro Technique)
@@ -1048,9 +1555,8 @@ How can I help you make the most of your time today, {user_name}?"""
 
 💡 **PM इंटर्नशिप के लिए:** अच्छी पढ़ाई की आदतें आपको इंटर्नशिप में भी सफल बनाएंगी!
 
-कौन सा विषय पढ़ने में दिक्कत आ रही है, {user_name}?"""
-        else:
-            return f"""📚 **Study Tips for {user_name}:**
+कौन सा विषय पढ़ने में दिक्कत आ रही है, {user_name}?""",
+    'English': """📚 **Study Tips for {user_name}:**
 
 🎯 **Better Focus:**
 • Study 25 mins, break 5 mins (Pomodoro Technique)
@@ -1066,10 +1572,10 @@ How can I help you make the most of your time today, {user_name}?"""
 
 💡 **PM Internship Connection:** Good study habits will make you excel in your internship too!
 
-What subject are you struggling with, {user_name}?"""
-    
-    elif any(phrase in message_lower for phrase in ['daily routine', 'schedule', 'time management', 'productivity', 'दिनचर्या', 'समय प्रबंधन']):
-        return f"""⏰ **Daily Planning for {user_name}:**
+What subject are you struggling with, {user_name}?""",
+}
+
+GENERAL_DAILY_ROUTINE_RESPONSE = """⏰ **Daily Planning for {user_name}:**
 
 🌅 **Morning Success Routine (6-9 AM):**
 • Wake up early and drink water
@@ -1092,10 +1598,9 @@ What subject are you struggling with, {user_name}?"""
 🎯 **Pro Tip:** Consistency beats perfection! Start with small changes.
 
 What part of your routine needs the most improvement, {user_name}?"""
-    
-    elif any(phrase in message_lower for phrase in ['motivate me', 'motivation', 'inspire', 'encouragement', 'feeling lazy', 'प्रेरणा', 'हिम्मत']):
-        if detected_lang == 'Hindi':
-            return f"""🚀 **{user_name} के लिए प्रेरणा:**
+
+GENERAL_MOTIVATION_RESPONSES = {
+    'Hindi': """🚀 **{user_name} के लिए प्रेरणा:**
 
 आप कर सकते हैं! यहाँ है आपका व्यक्तिगत प्रेरणादायक संदेश:
 
@@ -1116,9 +1621,8 @@ What part of your routine needs the most improvement, {user_name}?"""
 
 आप यहाँ हैं यही दिखाता है कि आप अपने भविष्य की परवाह करते हैं। यह पहले से ही जीत का रवैया है!
 
-आज हम किस लक्ष्य पर मिलकर काम कर सकते हैं, {user_name}?"""
-        else:
-            return f"""🚀 **Motivation Boost for {user_name}:**
+आज हम किस लक्ष्य पर मिलकर काम कर सकते हैं, {user_name}?""",
+    'English': """🚀 **Motivation Boost for {user_name}:**
 
 You've got this! Here's your personal pep talk:
 
@@ -1139,11 +1643,10 @@ You've got this! Here's your personal pep talk:
 
 The fact that you're here shows you care about your future. That's already a winning attitude, {user_name}! 
 
-What goal can we work on together today?"""
-    
-    # Technology questions
-    elif any(word in message_lower for word in ['technology', 'tech', 'programming', 'coding', 'software', 'computer', 'ai', 'machine learning', 'data science']):
-        return f"""💻 **Tech Insights for {user_name}:**
+What goal can we work on together today?""",
+}
+
+GENERAL_TECHNOLOGY_RESPONSE = """💻 **Tech Insights for {user_name}:**
 
 I can help with technology topics! While my primary expertise is PM Internship Scheme, I have general knowledge about:
 
@@ -1158,10 +1661,8 @@ I can help with technology topics! While my primary expertise is PM Internship S
 • Build skills while earning ₹5,000/month
 
 💡 **Want to know more about tech internships in PM Scheme?**"""
-    
-    # Education questions
-    elif any(word in message_lower for word in ['education', 'study', 'learn', 'course', 'degree', 'college', 'university', 'school']):
-        return f"""🎓 **Education Guidance for {user_name}:**
+
+GENERAL_EDUCATION_RESPONSE = """🎓 **Education Guidance for {user_name}:**
 
 Education is key to success! Here's what I can share:
 
@@ -1177,10 +1678,8 @@ Education is key to success! Here's what I can share:
 • Build both technical and soft skills
 
 🎯 **Ready to apply your education practically?**"""
-    
-    # Career questions
-    elif any(word in message_lower for word in ['career', 'job', 'work', 'employment', 'profession', 'future', 'growth']):
-        return f"""🚀 **Career Guidance for {user_name}:**
+
+GENERAL_CAREER_RESPONSE = """🚀 **Career Guidance for {user_name}:**
 
 Every great career starts with the right opportunities!
 
@@ -1198,10 +1697,8 @@ Every great career starts with the right opportunities!
 • Direct pathway to permanent employment
 
 ✨ **Transform your career potential - let's explore internship opportunities!**"""
-    
-    # General life questions
-    elif any(word in message_lower for word in ['life', 'success', 'motivation', 'inspire', 'dream', 'goal', 'future', 'advice']):
-        return f"""🌟 **Life Wisdom for {user_name}:**
+
+GENERAL_LIFE_RESPONSE = """🌟 **Life Wisdom for {user_name}:**
 
 Life is full of opportunities waiting to be seized!
 
@@ -1218,10 +1715,8 @@ Life is full of opportunities waiting to be seized!
 • Create a foundation for lifelong success
 
 💪 **Ready to take the next step in your journey?**"""
-    
-    # Health and wellness
-    elif any(word in message_lower for word in ['health', 'fitness', 'wellness', 'exercise', 'mental health', 'stress']):
-        return f"""💪 **Wellness Tips for {user_name}:**
+
+GENERAL_HEALTH_RESPONSE = """💪 **Wellness Tips for {user_name}:**
 
 Your health and well-being are incredibly important!
 
@@ -1238,10 +1733,8 @@ Your health and well-being are incredibly important!
 • Financial security supports overall well-being
 
 💡 **Build a healthy career foundation with PM Internship!**"""
-    
-    # General knowledge questions
-    else:
-        return f"""🤖 **Hi {user_name}! I'm PRIA, your knowledgeable assistant.**
+
+GENERAL_DEFAULT_RESPONSE = """🤖 **Hi {user_name}! I'm PRIA, your knowledgeable assistant.**
 
 I can help with a wide range of topics! While I'm specialized in PM Internship Scheme, I also have knowledge about:
 
@@ -1266,59 +1759,64 @@ I can help with a wide range of topics! While I'm specialized in PM Internship S
 
 🌟 **I'm here to help you succeed in every way possible!**"""
 
-def get_fallback_response(message):
-    """Enhanced intelligent fallback responses with multilingual personal assistant capabilities"""
-    message_lower = message.lower()
-    user_name = session.get('user_name', 'there')
+# Topic groups for get_enhanced_general_response, in priority order
+GENERAL_RESPONSE_INTENT = _intent_matcher((
+    ('food', ['what should i eat', 'food suggestion', 'hungry', 'meal idea', 'खाना', 'भोजन', 'जेवण']),
+    ('weather', ['weather', 'climate', 'temperature', 'rain', 'sunny']),
+    ('time', ['time', 'what time', 'current time', 'clock']),
+    ('joke', ['joke', 'funny', 'make me laugh', 'humor']),
+    ('study_tips', ['study tips', 'how to study', 'study better', 'concentration', 'focus', 'पढ़ाई', 'अध्ययन']),
+    ('daily_routine', ['daily routine', 'schedule', 'time management', 'productivity', 'दिनचर्या', 'समय प्रबंधन']),
+    ('motivation', ['motivate me', 'motivation', 'inspire', 'encouragement', 'feeling lazy', 'प्रेरणा', 'हिम्मत']),
+    ('technology', ['technology', 'tech', 'programming', 'coding', 'software', 'computer', 'ai', 'machine learning', 'data science']),
+    ('education', ['education', 'study', 'learn', 'course', 'degree', 'college', 'university', 'school']),
+    ('career', ['career', 'job', 'work', 'employment', 'profession', 'future', 'growth']),
+    ('life', ['life', 'success', 'motivation', 'inspire', 'dream', 'goal', 'future', 'advice']),
+    ('health', ['health', 'fitness', 'wellness', 'exercise', 'mental health', 'stress']),
+))
+
+# Intent -> canned answer for get_enhanced_general_response; anything unmatched gets the default
+GENERAL_RESPONSE_TEMPLATES = {
+    'weather': GENERAL_WEATHER_RESPONSE,
+    'time': GENERAL_TIME_RESPONSE,
+    'daily_routine': GENERAL_DAILY_ROUTINE_RESPONSE,
+    'technology': GENERAL_TECHNOLOGY_RESPONSE,
+    'education': GENERAL_EDUCATION_RESPONSE,
+    'career': GENERAL_CAREER_RESPONSE,
+    'life': GENERAL_LIFE_RESPONSE,
+    'health': GENERAL_HEALTH_RESPONSE,
+}
+
+# Intents answered in the user's language (English when there is no translation)
+GENERAL_LANGUAGE_RESPONSES = {
+    'food': GENERAL_FOOD_RESPONSES,
+    'study_tips': GENERAL_STUDY_TIPS_RESPONSES,
+    'motivation': GENERAL_MOTIVATION_RESPONSES,
+}
+
+def get_enhanced_general_response(message, user_name, message_lower=None, detected_lang=None):
+    """Enhanced general knowledge responses with personal assistant capabilities
+
+    Callers that already lowercased the message or detected its language can pass them in.
+    """
+    if message_lower is None:
+        message_lower = message.lower()
+    intent = GENERAL_RESPONSE_INTENT(message_lower)
     
-    # Detect language for multilingual responses
-    detected_lang = detect_user_language(message)
+    if intent == 'joke':
+        return _render_for_user(random.choice(GENERAL_JOKE_RESPONSES), user_name)
     
-    # Personal assistant responses for common interactions - Multilingual
-    if any(phrase in message_lower for phrase in ['how are you', 'how r u', 'how do you do', 'what\'s up', 'whats up', 'कैसे हो', 'कैसे हैं', 'कसे आहात', 'कसा आहेस']):
-        if detected_lang == 'Hindi':  # Hindi
-            responses = [
-                f"मैं बहुत अच्छा हूँ, {user_name}! 😊 मैं यहाँ हूँ और आपकी हर तरह से मदद करने को तैयार हूँ। चाहे PM इंटर्नशिप के बारे में हो या कोई और बात, मैं सुनने को तैयार हूँ! आप कैसे हैं आज?",
-                f"मैं बहुत खुश हूँ, पूछने के लिए धन्यवाद {user_name}! 🌟 मैं उत्साहित हूँ और आपकी सहायता करने को तैयार हूँ। उम्मीद है आपका दिन शानदार जा रहा है! मैं कैसे मदद कर सकता हूँ?",
-                f"मैं फैंटास्टिक हूँ, {user_name}! 😄 हमेशा खुश रहता हूँ आपसे बात करके। मैं 24/7 यहाँ हूँ आपके सवालों का जवाब देने के लिए। आपका दिन कैसे बेहतर बना सकता हूँ?"
-            ]
-        elif detected_lang == 'Marathi':  # Marathi
-            responses = [
-                f"मी खूप चांगला आहे, {user_name}! 😊 मी इथे आहे आणि तुमची सर्व प्रकारे मदत करायला तयार आहे। PM इंटर्नशिप बद्दल असो किंवा इतर काहीही, मी ऐकायला तयार आहे! तुम्ही आज कसे आहात?",
-                f"मी खूप आनंदी आहे, विचारल्याबद्दल धन्यवाद {user_name}! 🌟 मी उत्साहित आहे आणि तुमची मदत करायला तयार आहे। आशा आहे तुमचा दिवस छान जात आहे! मी कशी मदत करू शकते?",
-                f"मी फंटास्टिक आहे, {user_name}! 😄 तुमच्याशी बोलायला नेहमी आनंद होतो। मी 24/7 इथे आहे तुमच्या प्रश्नांची उत्तरे देण्यासाठी। तुमचा दिवस कसा चांगला करू शकते?"
-            ]
-        else:  # English
-            responses = [
-                f"I'm doing great, {user_name}! 😊 I'm here and ready to help you with anything you need. Whether it's about PM Internships or just a friendly chat, I'm all ears! How are you doing today?",
-                f"I'm wonderful, thank you for asking {user_name}! 🌟 I'm energized and excited to assist you. I hope you're having an amazing day! What can I help you with?",
-                f"I'm fantastic, {user_name}! 😄 Always happy to chat with you. I'm here 24/7 ready to help with your questions, whether about internships or anything else. How can I brighten your day?"
-            ]
-        return random.choice(responses)
-    
-    elif any(phrase in message_lower for phrase in ['thank you', 'thanks', 'thank u', 'ty', 'appreciated', 'grateful', 'धन्यवाद', 'शुक्रिया', 'थैंक यू']):
-        if detected_lang == 'Hindi':  # Hindi
-            responses = [
-                f"आपका बहुत स्वागत है, {user_name}! 😊 मुझे खुशी हुई कि मैं मदद कर सका। यही तो मेरा काम है! कभी भी कुछ और पूछने में झिझक न करें।",
-                f"मेरी खुशी है, {user_name}! 🌟 मुझे बहुत अच्छा लगता है जब मैं आपकी मदद कर पाता हूँ। जब भी सहायता चाहिए, बेझिझक पूछिए!",
-                f"आपका पूरी तरह स्वागत है, {user_name}! 💫 आपकी मदद करना मुझे खुशी देता है। मैं हमेशा यहाँ हूँ जब आपको जरूरत हो!"
-            ]
-        elif detected_lang == 'Marathi':  # Marathi
-            responses = [
-                f"तुमचे खूप स्वागत आहे, {user_name}! 😊 मला आनंद झाला की मी मदत करू शकलो। हेच तर माझे काम आहे! कधीही काही विचारायला लाज वाटू नका।",
-                f"माझा आनंद आहे, {user_name}! 🌟 मला खूप बरे वाटते जेव्हा मी तुमची मदत करू शकतो। जेव्हा मदत लागेल, निसंकोच विचारा!",
-                f"तुमचे पूर्ण स्वागत आहे, {user_name}! 💫 तुमची मदत करणे मला आनंद देते। जेव्हा गरज असेल तेव्हा मी नेहमी इथे आहे!"
-            ]
-        else:  # English
-            responses = [
-                f"You're very welcome, {user_name}! 😊 I'm so happy I could help. That's what I'm here for! Feel free to ask me anything else anytime.",
-                f"My pleasure, {user_name}! 🌟 It makes me so glad to be helpful. Don't hesitate to reach out whenever you need assistance!",
-                f"You're absolutely welcome, {user_name}! 💫 Helping you brings me joy. I'm always here when you need me!"
-            ]
-        return random.choice(responses)
-    
-    elif any(phrase in message_lower for phrase in ['what can you do', 'what do you do', 'your capabilities', 'what are you', 'who are you']):
-        return f"""🤖 **Hi {user_name}! I'm PRIA, your personal AI assistant!**
+    # Enhanced personal questions with multilingual support
+    if intent in GENERAL_LANGUAGE_RESPONSES:
+        if detected_lang is None:
+            detected_lang = detect_user_language(message)
+        responses = GENERAL_LANGUAGE_RESPONSES[intent]
+        return _render_for_user(responses.get(detected_lang, responses['English']), user_name)
+    
+    return _render_for_user(GENERAL_RESPONSE_TEMPLATES.get(intent, GENERAL_DEFAULT_RESPONSE), user_name)
+
+# Canned answers for get_fallback_response, filled in with .format(user_name=...)
+FALLBACK_CAPABILITIES_RESPONSE = """🤖 **Hi {user_name}! I'm PRIA, your personal AI assistant!**
 
 💫 **I'm here to be your helpful companion for:**
 
@@ -1341,33 +1839,8 @@ def get_fallback_response(message):
 🚀 **Available 24/7 to help you succeed!**
 
 What would you like to explore today, {user_name}?"""
-    
-    elif any(phrase in message_lower for phrase in ['good morning', 'good afternoon', 'good evening', 'good night']):
-        time_responses = {
-            'good morning': [
-                f"Good morning, {user_name}! ☀️ I hope you're starting your day with energy and positivity! What can I help you achieve today?",
-                f"A very good morning to you, {user_name}! 🌅 Ready to make today amazing? I'm here to support you in any way I can!"
-            ],
-            'good afternoon': [
-                f"Good afternoon, {user_name}! 🌞 I hope your day is going wonderfully! How can I assist you this afternoon?",
-                f"A lovely afternoon to you, {user_name}! ☀️ Hope you're having a productive day. What brings you here?"
-            ],
-            'good evening': [
-                f"Good evening, {user_name}! 🌆 I hope you've had a fantastic day! How can I help you this evening?",
-                f"Evening greetings, {user_name}! 🌅 Perfect time to wind down. What can I do for you?"
-            ],
-            'good night': [
-                f"Good night, {user_name}! 🌙 Sleep well and sweet dreams! I'll be here whenever you need me tomorrow!",
-                f"Wishing you a peaceful night, {user_name}! ✨ Rest well, and remember I'm always here when you need assistance!"
-            ]
-        }
-        
-        for greeting, responses in time_responses.items():
-            if greeting in message_lower:
-                return random.choice(responses)
-    
-    elif any(phrase in message_lower for phrase in ['i\'m sad', 'i am sad', 'feeling down', 'depressed', 'upset', 'not good']):
-        return f"""💙 I'm sorry to hear you're feeling down, {user_name}. 
+
+FALLBACK_SAD_RESPONSE = """💙 I'm sorry to hear you're feeling down, {user_name}. 
 
 🤗 **Remember that it's okay to feel this way sometimes.** Here are some things that might help:
 
@@ -1390,9 +1863,8 @@ What would you like to explore today, {user_name}?"""
 🎯 **Career-wise:** The PM Internship could be a great step toward a brighter future!
 
 I'm here if you want to talk more, {user_name}. You're not alone! 💙"""
-    
-    elif any(phrase in message_lower for phrase in ['i\'m happy', 'i am happy', 'feeling great', 'excited', 'wonderful', 'fantastic']):
-        return f"""🎉 That's absolutely wonderful, {user_name}! Your happiness is contagious! 
+
+FALLBACK_HAPPY_RESPONSE = """🎉 That's absolutely wonderful, {user_name}! Your happiness is contagious! 
 
 😊 **I love hearing that you're feeling great!** 
 
@@ -1407,47 +1879,10 @@ I'm here if you want to talk more, {user_name}. You're not alone! 💙"""
 • Spread positivity to others
 
 🌟 **Keep shining, {user_name}! What's making you so happy today?**"""
-    
-    # First check for general knowledge topics
-    general_response = get_enhanced_general_response(message, user_name)
-    if "PM Internship Connection" not in general_response and "My Specialty" not in general_response:
-        return general_response
-    
-    # Greeting responses
-    if any(word in message_lower for word in ['hi', 'hello', 'hey', 'namaste', 'good morning', 'good afternoon', 'good evening']):
-        # Get user profile for personalized greetings
-        user_profile = None
-        if session.get('user_id'):
-            user_profile = get_user_by_id(session.get('user_id'))
-        
-        # Personalized greetings based on profile status
-        if user_profile and user_profile.get('profile_completed'):
-            greetings = [
-                f"👋 Hello {user_name}! Great to see you back! Since your profile is complete, I can provide targeted internship guidance. What specific area would you like to explore?",
-                f"🌟 Hi {user_name}! Your profile looks excellent! I'm PRIA, ready to help you find the perfect PM Internship match. What's on your mind today?",
-                f"✨ Namaste {user_name}! With your complete profile, we can dive right into finding amazing internship opportunities. How can I assist you today?"
-            ]
-        elif user_profile and not user_profile.get('profile_completed'):
-            greetings = [
-                f"👋 Hello {user_name}! I'm PRIA, your PM Internship AI Assistant. I notice your profile needs completion - shall we work on that for better internship matches?",
-                f"🌟 Hi {user_name}! Welcome back! Completing your profile will unlock personalized internship recommendations. Want to finish it now?",
-                f"✨ Namaste {user_name}! I'm here to help with your PM Internship journey. Let's complete your profile first for the best experience!"
-            ]
-        else:
-            greetings = [
-                f"👋 Hello {user_name}! I'm PRIA, your personal PM Internship AI Assistant. Ready to explore amazing opportunities worth ₹66,000+ per year?",
-                f"🌟 Hi {user_name}! Welcome to your PM Internship journey! I'm here to make this life-changing opportunity accessible for you.",
-                f"✨ Namaste {user_name}! I'm PRIA, excited to guide you through the PM Internship Scheme. Let's start building your bright future!"
-            ]
-        return random.choice(greetings)
-    
-    # Application process
-    elif any(word in message_lower for word in ['apply', 'application', 'how to apply', 'process', 'steps']):
-        return f"🎯 **Application Process for {user_name}:**\\n\\n1️⃣ **Verify Eligibility** - Age 21-24, Indian citizen, income <₹8L\\n2️⃣ **Register** - Create account on official portal\\n3️⃣ **Profile Setup** - Complete your detailed profile\\n4️⃣ **Document Upload** - Aadhaar, certificates, income proof\\n5️⃣ **Browse & Apply** - Find matching internships\\n6️⃣ **Track Status** - Monitor your applications\\n\\n� **Pro Tip:** Complete your profile first for better matches!\\n\\n🔗 Ready to start? Visit the Apply section now!"
-    
-    # Eligibility - Enhanced with more specific details
-    elif any(word in message_lower for word in ['eligible', 'eligibility', 'criteria', 'qualify', 'requirements']):
-        return f"""✅ **Complete Eligibility Guide for {user_name}:**
+
+FALLBACK_APPLY_RESPONSE = "🎯 **Application Process for {user_name}:**\\n\\n1️⃣ **Verify Eligibility** - Age 21-24, Indian citizen, income <₹8L\\n2️⃣ **Register** - Create account on official portal\\n3️⃣ **Profile Setup** - Complete your detailed profile\\n4️⃣ **Document Upload** - Aadhaar, certificates, income proof\\n5️⃣ **Browse & Apply** - Find matching internships\\n6️⃣ **Track Status** - Monitor your applications\\n\\n� **Pro Tip:** Complete your profile first for better matches!\\n\\n🔗 Ready to start? Visit the Apply section now!"
+
+FALLBACK_ELIGIBILITY_RESPONSE = """✅ **Complete Eligibility Guide for {user_name}:**
 
 🏛️ **BASIC REQUIREMENTS:**
 • 🎂 Age: 21-24 years (as on 1st Oct of application year)
@@ -1483,10 +1918,8 @@ I'm here if you want to talk more, {user_name}. You're not alone! 💙"""
 
 💡 **If YES to all - You're likely eligible!** 
 Ready to check application process or need help with documents?"""
-    
-    # Specific eligibility questions - Income
-    elif any(phrase in message_lower for phrase in ['income limit', 'family income', '8 lakh', 'income criteria', 'income proof']):
-        return f"""💰 **Income Eligibility Details for {user_name}:**
+
+FALLBACK_INCOME_RESPONSE = """💰 **Income Eligibility Details for {user_name}:**
 
 📊 **INCOME LIMIT:**
 • Family income must be LESS than ₹8,00,000 per annum
@@ -1514,10 +1947,8 @@ Add father's + mother's + other earning members' annual income
 If total < ₹8,00,000 → You qualify!
 
 Need help with income certificate process?"""
-    
-    # Age-related eligibility
-    elif any(phrase in message_lower for phrase in ['age limit', 'age criteria', '21-24', 'too old', 'too young', 'age requirement']):
-        return f"""🎂 **Age Eligibility Guide for {user_name}:**
+
+FALLBACK_AGE_RESPONSE = """🎂 **Age Eligibility Guide for {user_name}:**
 
 📅 **EXACT AGE REQUIREMENT:**
 • Minimum: 21 years completed
@@ -1544,10 +1975,8 @@ Need help with income certificate process?"""
 What's your date of birth? I can tell you if you're eligible!
 
 Ready to check other eligibility criteria?"""
-    
-    # Benefits and stipend
-    elif any(word in message_lower for word in ['stipend', 'benefit', 'salary', 'money', 'payment', 'allowance', 'grant']):
-        return f"""💰 **Amazing Benefits Awaiting {user_name}:**
+
+FALLBACK_BENEFITS_RESPONSE = """💰 **Amazing Benefits Awaiting {user_name}:**
 
 💵 **Monthly Stipend:** ₹5,000
    • ₹4,500 from Central Government
@@ -1568,14 +1997,10 @@ Ready to check other eligibility criteria?"""
    • Professional networking
 
 💡 **Total Value:** ₹66,000+ per year!"""
-    
-    # Documents
-    elif any(word in message_lower for word in ['document', 'documents', 'papers', 'certificates', 'upload']):
-        return f"📄 **Required Documents for {user_name}:**\\n\\n� **Identity:**\\n• Aadhaar Card (mandatory)\\n• PAN Card (if available)\\n\\n🎓 **Educational:**\\n• 10th & 12th certificates\\n• Graduation/Diploma certificate\\n• Mark sheets\\n\\n💰 **Income Proof:**\\n• Family income certificate\\n• Income tax returns (if applicable)\\n\\n🏦 **Banking:**\\n• Bank account details\\n• Cancelled cheque\\n\\n📸 **Others:**\\n• Passport size photograph\\n• Caste certificate (if applicable)\\n\\n💡 **Tip:** Keep all documents in PDF format, max 2MB each!"
-    
-    # Contact and support
-    elif any(word in message_lower for word in ['help', 'support', 'contact', 'phone', 'email', 'assistance']):
-        return f"""📞 **Get Support, {user_name}:**
+
+FALLBACK_DOCUMENTS_RESPONSE = "📄 **Required Documents for {user_name}:**\\n\\n� **Identity:**\\n• Aadhaar Card (mandatory)\\n• PAN Card (if available)\\n\\n🎓 **Educational:**\\n• 10th & 12th certificates\\n• Graduation/Diploma certificate\\n• Mark sheets\\n\\n💰 **Income Proof:**\\n• Family income certificate\\n• Income tax returns (if applicable)\\n\\n🏦 **Banking:**\\n• Bank account details\\n• Cancelled cheque\\n\\n📸 **Others:**\\n• Passport size photograph\\n• Caste certificate (if applicable)\\n\\n💡 **Tip:** Keep all documents in PDF format, max 2MB each!"
+
+FALLBACK_SUPPORT_RESPONSE = """📞 **Get Support, {user_name}:**
 
 📧 **Email Support:**
 • contact-pminternship@gov.in
@@ -1596,45 +2021,228 @@ Ready to check other eligibility criteria?"""
 • Video tutorials
 
 ❓ **Need immediate help? I'm here to assist you right now!**"""
+
+FALLBACK_DEFAULT_RESPONSE = "🤖 **Hi {user_name}! I'm PRIA, your PM Internship Assistant.**\\n\\n🎯 **I can help you with:**\\n\\n✨ **Getting Started:**\\n• Eligibility criteria & requirements\\n• Application process & steps\\n• Document preparation\\n\\n� **Benefits & Details:**\\n• Stipend & financial benefits\\n• Available sectors & companies\\n• Duration & timeline\\n\\n🔍 **Application Support:**\\n• Status tracking\\n• Interview preparation\\n• Technical assistance\\n\\n� **Contact & Help:**\\n• Support channels\\n• FAQ resolution\\n\\n💬 **Just ask me anything!** For example:\\n'Am I eligible?' or 'How to apply?' or 'What documents needed?'\\n\\n🌟 **Ready to start your internship journey?**"
+
+FALLBACK_HOW_ARE_YOU_RESPONSES = {
+    'Hindi': (
+        "मैं बहुत अच्छा हूँ, {user_name}! 😊 मैं यहाँ हूँ और आपकी हर तरह से मदद करने को तैयार हूँ। चाहे PM इंटर्नशिप के बारे में हो या कोई और बात, मैं सुनने को तैयार हूँ! आप कैसे हैं आज?",
+        "मैं बहुत खुश हूँ, पूछने के लिए धन्यवाद {user_name}! 🌟 मैं उत्साहित हूँ और आपकी सहायता करने को तैयार हूँ। उम्मीद है आपका दिन शानदार जा रहा है! मैं कैसे मदद कर सकता हूँ?",
+        "मैं फैंटास्टिक हूँ, {user_name}! 😄 हमेशा खुश रहता हूँ आपसे बात करके। मैं 24/7 यहाँ हूँ आपके सवालों का जवाब देने के लिए। आपका दिन कैसे बेहतर बना सकता हूँ?"
+    ),
+    'Marathi': (
+        "मी खूप चांगला आहे, {user_name}! 😊 मी इथे आहे आणि तुमची सर्व प्रकारे मदत करायला तयार आहे। PM इंटर्नशिप बद्दल असो किंवा इतर काहीही, मी ऐकायला तयार आहे! तुम्ही आज कसे आहात?",
+        "मी खूप आनंदी आहे, विचारल्याबद्दल धन्यवाद {user_name}! 🌟 मी उत्साहित आहे आणि तुमची मदत करायला तयार आहे। आशा आहे तुमचा दिवस छान जात आहे! मी कशी मदत करू शकते?",
+        "मी फंटास्टिक आहे, {user_name}! 😄 तुमच्याशी बोलायला नेहमी आनंद होतो। मी 24/7 इथे आहे तुमच्या प्रश्नांची उत्तरे देण्यासाठी। तुमचा दिवस कसा चांगला करू शकते?"
+    ),
+    'English': (
+        "I'm doing great, {user_name}! 😊 I'm here and ready to help you with anything you need. Whether it's about PM Internships or just a friendly chat, I'm all ears! How are you doing today?",
+        "I'm wonderful, thank you for asking {user_name}! 🌟 I'm energized and excited to assist you. I hope you're having an amazing day! What can I help you with?",
+        "I'm fantastic, {user_name}! 😄 Always happy to chat with you. I'm here 24/7 ready to help with your questions, whether about internships or anything else. How can I brighten your day?"
+    )
+}
+
+FALLBACK_THANKS_RESPONSES = {
+    'Hindi': (
+        "आपका बहुत स्वागत है, {user_name}! 😊 मुझे खुशी हुई कि मैं मदद कर सका। यही तो मेरा काम है! कभी भी कुछ और पूछने में झिझक न करें।",
+        "मेरी खुशी है, {user_name}! 🌟 मुझे बहुत अच्छा लगता है जब मैं आपकी मदद कर पाता हूँ। जब भी सहायता चाहिए, बेझिझक पूछिए!",
+        "आपका पूरी तरह स्वागत है, {user_name}! 💫 आपकी मदद करना मुझे खुशी देता है। मैं हमेशा यहाँ हूँ जब आपको जरूरत हो!"
+    ),
+    'Marathi': (
+        "तुमचे खूप स्वागत आहे, {user_name}! 😊 मला आनंद झाला की मी मदत करू शकलो। हेच तर माझे काम आहे! कधीही काही विचारायला लाज वाटू नका।",
+        "माझा आनंद आहे, {user_name}! 🌟 मला खूप बरे वाटते जेव्हा मी तुमची मदत करू शकतो। जेव्हा मदत लागेल, निसंकोच विचारा!",
+        "तुमचे पूर्ण स्वागत आहे, {user_name}! 💫 तुमची मदत करणे मला आनंद देते। जेव्हा गरज असेल तेव्हा मी नेहमी इथे आहे!"
+    ),
+    'English': (
+        "You're very welcome, {user_name}! 😊 I'm so happy I could help. That's what I'm here for! Feel free to ask me anything else anytime.",
+        "My pleasure, {user_name}! 🌟 It makes me so glad to be helpful. Don't hesitate to reach out whenever you need assistance!",
+        "You're absolutely welcome, {user_name}! 💫 Helping you brings me joy. I'm always here when you need me!"
+    )
+}
+
+FALLBACK_GREETING_RESPONSES = {
+    'profile_complete': (
+        "👋 Hello {user_name}! Great to see you back! Since your profile is complete, I can provide targeted internship guidance. What specific area would you like to explore?",
+        "🌟 Hi {user_name}! Your profile looks excellent! I'm PRIA, ready to help you find the perfect PM Internship match. What's on your mind today?",
+        "✨ Namaste {user_name}! With your complete profile, we can dive right into finding amazing internship opportunities. How can I assist you today?"
+    ),
+    'profile_incomplete': (
+        "👋 Hello {user_name}! I'm PRIA, your PM Internship AI Assistant. I notice your profile needs completion - shall we work on that for better internship matches?",
+        "🌟 Hi {user_name}! Welcome back! Completing your profile will unlock personalized internship recommendations. Want to finish it now?",
+        "✨ Namaste {user_name}! I'm here to help with your PM Internship journey. Let's complete your profile first for the best experience!"
+    ),
+    'new_user': (
+        "👋 Hello {user_name}! I'm PRIA, your personal PM Internship AI Assistant. Ready to explore amazing opportunities worth ₹66,000+ per year?",
+        "🌟 Hi {user_name}! Welcome to your PM Internship journey! I'm here to make this life-changing opportunity accessible for you.",
+        "✨ Namaste {user_name}! I'm PRIA, excited to guide you through the PM Internship Scheme. Let's start building your bright future!"
+    )
+}
+
+FALLBACK_TIME_GREETING_RESPONSES = {
+    'good morning': [
+        "Good morning, {user_name}! ☀️ I hope you're starting your day with energy and positivity! What can I help you achieve today?",
+        "A very good morning to you, {user_name}! 🌅 Ready to make today amazing? I'm here to support you in any way I can!"
+    ],
+    'good afternoon': [
+        "Good afternoon, {user_name}! 🌞 I hope your day is going wonderfully! How can I assist you this afternoon?",
+        "A lovely afternoon to you, {user_name}! ☀️ Hope you're having a productive day. What brings you here?"
+    ],
+    'good evening': [
+        "Good evening, {user_name}! 🌆 I hope you've had a fantastic day! How can I help you this evening?",
+        "Evening greetings, {user_name}! 🌅 Perfect time to wind down. What can I do for you?"
+    ],
+    'good night': [
+        "Good night, {user_name}! 🌙 Sleep well and sweet dreams! I'll be here whenever you need me tomorrow!",
+        "Wishing you a peaceful night, {user_name}! ✨ Rest well, and remember I'm always here when you need assistance!"
+    ]
+}
+
+# Keyword groups for get_fallback_response, in priority order; matched in a single scan
+FALLBACK_INTENT = _intent_matcher((
+    ('how_are_you', ['how are you', 'how r u', 'how do you do', 'what\'s up', 'whats up', 'कैसे हो', 'कैसे हैं', 'कसे आहात', 'कसा आहेस']),
+    ('thanks', ['thank you', 'thanks', 'thank u', 'ty', 'appreciated', 'grateful', 'धन्यवाद', 'शुक्रिया', 'थैंक यू']),
+    ('capabilities', ['what can you do', 'what do you do', 'your capabilities', 'what are you', 'who are you']),
+    ('time_greeting', ['good morning', 'good afternoon', 'good evening', 'good night']),
+    ('sad', ['i\'m sad', 'i am sad', 'feeling down', 'depressed', 'upset', 'not good']),
+    ('happy', ['i\'m happy', 'i am happy', 'feeling great', 'excited', 'wonderful', 'fantastic']),
+    ('greeting', ['hi', 'hello', 'hey', 'namaste']),
+    ('apply', ['apply', 'application', 'how to apply', 'process', 'steps']),
+    ('eligibility', ['eligible', 'eligibility', 'criteria', 'qualify', 'requirements']),
+    ('income', ['income limit', 'family income', '8 lakh', 'income criteria', 'income proof']),
+    ('age', ['age limit', 'age criteria', '21-24', 'too old', 'too young', 'age requirement']),
+    ('benefits', ['stipend', 'benefit', 'salary', 'money', 'payment', 'allowance', 'grant']),
+    ('documents', ['document', 'documents', 'papers', 'certificates', 'upload']),
+    ('support', ['help', 'support', 'contact', 'phone', 'email', 'assistance']),
+))
+
+# Intent -> canned answer for get_fallback_response
+FALLBACK_PERSONAL_TEMPLATES = {
+    'capabilities': FALLBACK_CAPABILITIES_RESPONSE,
+    'sad': FALLBACK_SAD_RESPONSE,
+    'happy': FALLBACK_HAPPY_RESPONSE,
+}
+
+FALLBACK_LANGUAGE_RESPONSES = {
+    'how_are_you': FALLBACK_HOW_ARE_YOU_RESPONSES,
+    'thanks': FALLBACK_THANKS_RESPONSES,
+}
+
+# PM Internship FAQ answers, used only when the general responder defers
+FALLBACK_FAQ_TEMPLATES = {
+    'apply': FALLBACK_APPLY_RESPONSE,
+    'eligibility': FALLBACK_ELIGIBILITY_RESPONSE,
+    'income': FALLBACK_INCOME_RESPONSE,
+    'age': FALLBACK_AGE_RESPONSE,
+    'benefits': FALLBACK_BENEFITS_RESPONSE,
+    'documents': FALLBACK_DOCUMENTS_RESPONSE,
+    'support': FALLBACK_SUPPORT_RESPONSE,
+}
+
+def get_fallback_response(message):
+    """Enhanced intelligent fallback responses with multilingual personal assistant capabilities"""
+    message_lower = message.lower()
+    user_name = session.get('user_name', 'there')
+    intent = FALLBACK_INTENT(message_lower)
     
-    # General fallback with personalized suggestions
-    else:
-        return f"🤖 **Hi {user_name}! I'm PRIA, your PM Internship Assistant.**\\n\\n🎯 **I can help you with:**\\n\\n✨ **Getting Started:**\\n• Eligibility criteria & requirements\\n• Application process & steps\\n• Document preparation\\n\\n� **Benefits & Details:**\\n• Stipend & financial benefits\\n• Available sectors & companies\\n• Duration & timeline\\n\\n🔍 **Application Support:**\\n• Status tracking\\n• Interview preparation\\n• Technical assistance\\n\\n� **Contact & Help:**\\n• Support channels\\n• FAQ resolution\\n\\n💬 **Just ask me anything!** For example:\\n'Am I eligible?' or 'How to apply?' or 'What documents needed?'\\n\\n🌟 **Ready to start your internship journey?**"
+    # Detect language for multilingual responses
+    detected_lang = detect_user_language(message)
+    
+    # Personal assistant responses for common interactions - Multilingual
+    if intent in FALLBACK_LANGUAGE_RESPONSES:
+        responses = FALLBACK_LANGUAGE_RESPONSES[intent]
+        responses = responses.get(detected_lang, responses['English'])
+        return _render_for_user(random.choice(responses), user_name)
+    
+    if intent in FALLBACK_PERSONAL_TEMPLATES:
+        return _render_for_user(FALLBACK_PERSONAL_TEMPLATES[intent], user_name)
+    
+    if intent == 'time_greeting':
+        for greeting, responses in FALLBACK_TIME_GREETING_RESPONSES.items():
+            if greeting in message_lower:
+                return _render_for_user(random.choice(responses), user_name)
+    
+    # First check for general knowledge topics
+    general_response = get_enhanced_general_response(message, user_name, message_lower, detected_lang)
+    if "PM Internship Connection" not in general_response and "My Specialty" not in general_response:
+        return general_response
+    
+    # Greeting responses
+    if intent == 'greeting':
+        # Get user profile for personalized greetings
+        user_profile = None
+        if session.get('user_id'):
+            user_profile = get_chat_user_profile(session.get('user_id'))
+        
+        # Personalized greetings based on profile status
+        if user_profile and user_profile.get('profile_completed'):
+            greetings = FALLBACK_GREETING_RESPONSES['profile_complete']
+        elif user_profile and not user_profile.get('profile_completed'):
+            greetings = FALLBACK_GREETING_RESPONSES['profile_incomplete']
+        else:
+            greetings = FALLBACK_GREETING_RESPONSES['new_user']
+        return _render_for_user(random.choice(greetings), user_name)
+    
+    # FAQ answers, or a general fallback with personalized suggestions
+    return _render_for_user(FALLBACK_FAQ_TEMPLATES.get(intent, FALLBACK_DEFAULT_RESPONSE), user_name)
 
 # ENHANCED: Skill Matching Algorithm with Government Priority
-def calculate_skill_match_score(user_skills_string, required_skills_list, user_profile=None):
-    """
-    Calculate skill match percentage between user and job requirements
-    Returns a score from 0-100 based on skill compatibility
+
+# Common skill variations
+SKILL_VARIATIONS = {
+    'python': ['py', 'python3', 'python programming'],
+    'javascript': ['js', 'node.js', 'nodejs', 'react', 'angular', 'vue'],
+    'java': ['java programming', 'core java', 'advanced java'],
+    'sql': ['mysql', 'postgresql', 'database', 'rdbms'],
+    'machine learning': ['ml', 'ai', 'artificial intelligence', 'deep learning'],
+    'data analysis': ['data science', 'analytics', 'statistics'],
+    'web development': ['html', 'css', 'frontend', 'backend'],
+    'communication': ['english', 'presentation', 'speaking'],
+}
+
+# Inverted once: a (user_skill, required_skill) pair is a variation match when one
+# side is the base skill and the other one of its variations, in either direction
+SKILL_VARIATION_PAIRS = frozenset(
+    pair
+    for base_skill, variations in SKILL_VARIATIONS.items()
+    for variation in variations
+    for pair in ((base_skill, variation), (variation, base_skill))
+)
+
+# Substring keywords for the profile bonus, each checked in a single regex scan
+TECH_QUALIFICATION_PATTERN = re.compile('|'.join(map(re.escape, ['engineering', 'btech', 'computer', 'it', 'technology'])))
+JOB_SECTOR_PATTERN = re.compile('|'.join(map(re.escape, ['technology', 'finance', 'healthcare', 'engineering', 'management'])))
+
+@lru_cache(maxsize=1024)
+def _normalize_skills(skills):
+    """Stripped, lowercased, non-empty skills as a tuple.
+
+    Each job's requirement list (and each user's skills) is normalised once and
+    then reused every time recommendations are scored.
     """
-    if not user_skills_string or not required_skills_list:
-        return 0
+    return tuple(skill.strip().lower() for skill in skills if skill and skill.strip())
 
-    # Handle skills whether they're a list or comma-separated string
-    if isinstance(user_skills_string, list):
-        user_skills = [skill.strip().lower() for skill in user_skills_string if skill and skill.strip()]
-    else:
-        user_skills = [skill.strip().lower() for skill in str(user_skills_string).split(',') if skill.strip()]
-    
-    required_skills = [skill.strip().lower() for skill in required_skills_list if skill.strip()]
-    
-    if not user_skills or not required_skills:
-        return 0
+@lru_cache(maxsize=8192)
+def _skill_overlap_percentage(user_skills, required_skills):
+    """Skill-only part of calculate_skill_match_score, memoized per skill-tuple pair.
 
+    Both arguments are tuples of stripped, lowercased skills. The same user is
+    scored against many jobs that share requirement lists, so pairs repeat.
+    """
     match_score = 0
     total_weight = len(required_skills)
+    user_skill_set = frozenset(user_skills)
     
     for req_skill in required_skills:
+        # Exact match is the best possible score, so skip the fuzzy comparisons
+        if req_skill in user_skill_set:
+            match_score += 1.0
+            continue
+        
         best_match_score = 0
         
         for user_skill in user_skills:
-            # Exact match
-            if user_skill == req_skill:
-                best_match_score = 1.0
-                break
-            
             # Partial match using fuzzy matching
-            similarity = difflib.SequenceMatcher(None, user_skill, req_skill).ratio()
+            similarity = similarity_ratio(user_skill, req_skill)
             if similarity > 0.8:  # 80% similarity threshold
                 best_match_score = max(best_match_score, similarity)
             
@@ -1643,26 +2251,34 @@ def calculate_skill_match_score(user_skills_string, required_skills_list, user_p
                 best_match_score = max(best_match_score, 0.9)
             
             # Common skill variations
-            skill_variations = {
-                'python': ['py', 'python3', 'python programming'],
-                'javascript': ['js', 'node.js', 'nodejs', 'react', 'angular', 'vue'],
-                'java': ['java programming', 'core java', 'advanced java'],
-                'sql': ['mysql', 'postgresql', 'database', 'rdbms'],
-                'machine learning': ['ml', 'ai', 'artificial intelligence', 'deep learning'],
-                'data analysis': ['data science', 'analytics', 'statistics'],
-                'web development': ['html', 'css', 'frontend', 'backend'],
-                'communication': ['english', 'presentation', 'speaking'],
-            }
-            
-            for base_skill, variations in skill_variations.items():
-                if (req_skill == base_skill and user_skill in variations) or \
-                   (user_skill == base_skill and req_skill in variations):
-                    best_match_score = max(best_match_score, 0.95)
+            if (user_skill, req_skill) in SKILL_VARIATION_PAIRS:
+                best_match_score = max(best_match_score, 0.95)
         
         match_score += best_match_score
 
     # Calculate percentage
-    percentage = (match_score / total_weight) * 100
+    return (match_score / total_weight) * 100
+
+def calculate_skill_match_score(user_skills_string, required_skills_list, user_profile=None):
+    """
+    Calculate skill match percentage between user and job requirements
+    Returns a score from 0-100 based on skill compatibility
+    """
+    if not user_skills_string or not required_skills_list:
+        return 0
+
+    # Handle skills whether they're a list or comma-separated string
+    if isinstance(user_skills_string, list):
+        user_skills = _normalize_skills(tuple(user_skills_string))
+    else:
+        user_skills = _normalize_skills(tuple(str(user_skills_string).split(',')))
+    
+    required_skills = _normalize_skills(tuple(required_skills_list))
+    
+    if not user_skills or not required_skills:
+        return 0
+
+    percentage = _skill_overlap_percentage(user_skills, required_skills)
     
     # Add bonus points based on user profile completeness and other factors
     bonus_points = 0
@@ -1670,14 +2286,13 @@ def calculate_skill_match_score(user_skills_string, required_skills_list, user_p
         # Bonus for relevant qualification
         if user_profile.get('qualification'):
             qualification = user_profile['qualification'].lower()
-            if any(edu in qualification for edu in ['engineering', 'btech', 'computer', 'it', 'technology']):
+            if TECH_QUALIFICATION_PATTERN.search(qualification):
                 bonus_points += 5
         
         # Bonus for relevant area of interest
         if user_profile.get('area_of_interest'):
             interest = user_profile['area_of_interest'].lower()
-            job_sectors = ['technology', 'finance', 'healthcare', 'engineering', 'management']
-            if any(sector in interest for sector in job_sectors):
+            if JOB_SECTOR_PATTERN.search(interest):
                 bonus_points += 3
         
         # Bonus for prior internship experience
@@ -1717,9 +2332,10 @@ def sort_recommendations_by_match(recommendations, user):
         else:
             private_recs.append((match_score, rec))
     
-    # Sort each category by match score
-    government_recs.sort(key=lambda x: x[0], reverse=True)
-    private_recs.sort(key=lambda x: x[0], reverse=True)
+    # Best of each category by match score; at most 5 government and 3 private
+    # picks can ever make the top 5, so only those are selected
+    government_recs = heapq.nlargest(5, government_recs, key=itemgetter(0))
+    private_recs = heapq.nlargest(3, private_recs, key=itemgetter(0))
     
     # Create balanced top 5: 3 government + 2 private-based (or best available mix)
     top_recommendations = []
@@ -1749,6 +2365,179 @@ def sort_recommendations_by_match(recommendations, user):
     
     return top_recommendations[:5]
 
+# BALANCED POOL: Equal mix of government and private-based opportunities
+# Static catalog; get_enhanced_default_recommendations scores shallow copies
+DEFAULT_RECOMMENDATIONS = (
+    # GOVERNMENT INTERNSHIPS (7 options - high quality)
+    {
+        "company": "ISRO",
+        "title": "Space Technology Research Intern",
+        "type": "government",
+        "sector": "Space Technology & Research",
+        "skills": ["Programming", "Research", "Data Analysis", "MATLAB", "Python"],
+        "duration": "6 Months",
+        "location": "Bangalore/Thiruvananthapuram",
+        "stipend": "₹25,000/month",
+        "description": "🚀 Join India's premier space agency! Work on cutting-edge satellite technology and space missions. Contribute to national space research programs."
+    },
+    {
+        "company": "DRDO",
+        "title": "Defence Technology Intern",
+        "type": "government",
+        "sector": "Defence Research & Development",
+        "skills": ["Research", "Engineering", "Technical Analysis", "Problem Solving", "Innovation"],
+        "duration": "4 Months",
+        "location": "Delhi/Pune/Hyderabad",
+        "stipend": "₹22,000/month",
+        "description": "🛡️ Shape India's defence future! Work on advanced defence technologies and contribute to national security research projects."
+    },
+    {
+        "company": "NITI Aayog",
+        "title": "Policy Research & Analysis Intern",
+        "type": "government",
+        "sector": "Public Policy & Governance",
+        "skills": ["Research", "Policy Analysis", "Data Interpretation", "Report Writing", "Communication"],
+        "duration": "4 Months",
+        "location": "New Delhi",
+        "stipend": "₹20,000/month",
+        "description": "🏛️ Impact India's development! Research policy solutions and contribute to national development strategies."
+    },
+    {
+        "company": "Indian Railways",
+        "title": "Railway Operations & Technology Intern",
+        "type": "government",
+        "sector": "Transportation & Logistics",
+        "skills": ["Operations Management", "Logistics", "Engineering", "Project Management", "Data Analysis"],
+        "duration": "5 Months",
+        "location": "Multiple Cities",
+        "stipend": "₹18,000/month",
+        "description": "🚂 Power India's lifeline! Learn operations of world's largest railway network."
+    },
+    {
+        "company": "CSIR Labs",
+        "title": "Scientific Research Intern",
+        "type": "government",
+        "sector": "Scientific Research",
+        "skills": ["Research", "Data Analysis", "Laboratory Skills", "Scientific Writing", "Innovation"],
+        "duration": "6 Months",
+        "location": "Multiple CSIR Centers",
+        "stipend": "₹24,000/month",
+        "description": "🔬 Advance scientific knowledge! Work with India's premier scientific research organization."
+    },
+    {
+        "company": "Ministry of Electronics & IT",
+        "title": "Digital India Technology Intern",
+        "type": "government",
+        "sector": "Digital Governance",
+        "skills": ["Programming", "Digital Literacy", "Web Development", "Data Management", "Cybersecurity"],
+        "duration": "4 Months",
+        "location": "New Delhi/Pune",
+        "stipend": "₹21,000/month",
+        "description": "💻 Build Digital India! Contribute to nation's digital transformation and e-governance initiatives."
+    },
+    {
+        "company": "BARC",
+        "title": "Nuclear Technology Research Intern",
+        "type": "government",
+        "sector": "Nuclear Research",
+        "skills": ["Engineering", "Research", "Data Analysis", "Safety Protocols", "Technical Documentation"],
+        "duration": "5 Months",
+        "location": "Mumbai/Kalpakkam",
+        "stipend": "₹26,000/month",
+        "description": "⚛️ Power India's future! Work on nuclear technology and contribute to clean energy research."
+    },
+
+    # PRIVATE-BASED INTERNSHIPS (8 options - high quality with competitive stipends)
+    {
+        "company": "TCS (Tata Consultancy Services)",
+        "title": "Software Development Intern",
+        "type": "private-based",
+        "sector": "IT Services",
+        "skills": ["Java", "Python", "Programming", "Problem Solving", "Communication"],
+        "duration": "3 Months",
+        "location": "Multiple Cities",
+        "stipend": "₹30,000/month",
+        "description": "💼 Industry leader experience! Work on enterprise software projects with India's largest IT company."
+    },
+    {
+        "company": "Infosys",
+        "title": "Digital Innovation Intern",
+        "type": "private-based",
+        "sector": "IT Consulting",
+        "skills": ["Digital Technologies", "Innovation", "Cloud Computing", "Problem Solving", "Teamwork"],
+        "duration": "3 Months",
+        "location": "Bangalore/Pune",
+        "stipend": "₹28,000/month",
+        "description": "🌟 Innovation at scale! Work on cutting-edge digital transformation projects with global impact."
+    },
+    {
+        "company": "Wipro",
+        "title": "Technology Solutions Intern",
+        "type": "private-based",
+        "sector": "IT Services",
+        "skills": ["Cloud Computing", "DevOps", "Programming", "Agile", "Learning Agility"],
+        "duration": "4 Months",
+        "location": "Pune/Bangalore",
+        "stipend": "₹32,000/month",
+        "description": "☁️ Future-ready skills! Gain hands-on experience with cloud technologies and modern development practices."
+    },
+    {
+        "company": "Microsoft India",
+        "title": "Technology Trainee",
+        "type": "private-based",
+        "sector": "Technology",
+        "skills": ["Programming", "AI/ML", "Cloud Platforms", "Data Science", "Innovation"],
+        "duration": "3 Months",
+        "location": "Hyderabad/Bangalore",
+        "stipend": "₹40,000/month",
+        "description": "🚀 Global technology experience! Work with cutting-edge Microsoft technologies and AI platforms."
+    },
+    {
+        "company": "Google India",
+        "title": "Software Engineering Intern",
+        "type": "private-based",
+        "sector": "Technology",
+        "skills": ["Programming", "Algorithms", "Data Structures", "Problem Solving", "Software Design"],
+        "duration": "4 Months",
+        "location": "Bangalore/Gurgaon",
+        "stipend": "₹50,000/month",
+        "description": "🌟 Dream opportunity! Work with world-class engineers on products used by billions."
+    },
+    {
+        "company": "Amazon India",
+        "title": "SDE Intern",
+        "type": "private-based",
+        "sector": "E-commerce Technology",
+        "skills": ["Programming", "System Design", "AWS", "Data Structures", "Problem Solving"],
+        "duration": "3 Months",
+        "location": "Bangalore/Hyderabad",
+        "stipend": "₹45,000/month",
+        "description": "📦 Scale at Amazon! Work on systems handling millions of customers and learn cloud technologies."
+    },
+    {
+        "company": "HDFC Bank",
+        "title": "Banking Technology Intern",
+        "type": "private-based",
+        "sector": "Financial Services",
+        "skills": ["Financial Technology", "Data Analysis", "Banking Operations", "Communication", "Excel"],
+        "duration": "3 Months",
+        "location": "Mumbai/Pune",
+        "stipend": "₹25,000/month",
+        "description": "🏦 FinTech innovation! Experience digital banking transformation with India's leading private bank."
+    },
+    {
+        "company": "Accenture",
+        "title": "Technology Consulting Intern",
+        "type": "private-based",
+        "sector": "IT Consulting",
+        "skills": ["Business Analysis", "Technology Consulting", "Communication", "Problem Solving", "Project Management"],
+        "duration": "4 Months",
+        "location": "Multiple Cities",
+        "stipend": "₹27,000/month",
+        "description": "💡 Consulting excellence! Work with global clients on technology transformation projects."
+    }
+)
+
 def get_enhanced_default_recommendations(user):
     """Enhanced recommendations with BALANCED MIX - Government priority but shows both types"""
     area_of_interest = user.get('area_of_interest', '').lower() if user else ''
@@ -1762,180 +2551,125 @@ def get_enhanced_default_recommendations(user):
     
     qualification = user.get('qualification', '').lower() if user else ''
     
-    # BALANCED POOL: Equal mix of government and private-based opportunities
-    all_recommendations = [
-        # GOVERNMENT INTERNSHIPS (7 options - high quality)
-        {
-            "company": "ISRO",
-            "title": "Space Technology Research Intern",
-            "type": "government",
-            "sector": "Space Technology & Research",
-            "skills": ["Programming", "Research", "Data Analysis", "MATLAB", "Python"],
-            "duration": "6 Months",
-            "location": "Bangalore/Thiruvananthapuram",
-            "stipend": "₹25,000/month",
-            "description": "🚀 Join India's premier space agency! Work on cutting-edge satellite technology and space missions. Contribute to national space research programs."
-        },
-        {
-            "company": "DRDO",
-            "title": "Defence Technology Intern",
-            "type": "government",
-            "sector": "Defence Research & Development",
-            "skills": ["Research", "Engineering", "Technical Analysis", "Problem Solving", "Innovation"],
-            "duration": "4 Months",
-            "location": "Delhi/Pune/Hyderabad",
-            "stipend": "₹22,000/month",
-            "description": "🛡️ Shape India's defence future! Work on advanced defence technologies and contribute to national security research projects."
-        },
-        {
-            "company": "NITI Aayog",
-            "title": "Policy Research & Analysis Intern",
-            "type": "government",
-            "sector": "Public Policy & Governance",
-            "skills": ["Research", "Policy Analysis", "Data Interpretation", "Report Writing", "Communication"],
-            "duration": "4 Months",
-            "location": "New Delhi",
-            "stipend": "₹20,000/month",
-            "description": "🏛️ Impact India's development! Research policy solutions and contribute to national development strategies."
-        },
-        {
-            "company": "Indian Railways",
-            "title": "Railway Operations & Technology Intern",
-            "type": "government",
-            "sector": "Transportation & Logistics",
-            "skills": ["Operations Management", "Logistics", "Engineering", "Project Management", "Data Analysis"],
-            "duration": "5 Months",
-            "location": "Multiple Cities",
-            "stipend": "₹18,000/month",
-            "description": "🚂 Power India's lifeline! Learn operations of world's largest railway network."
-        },
-        {
-            "company": "CSIR Labs",
-            "title": "Scientific Research Intern",
-            "type": "government",
-            "sector": "Scientific Research",
-            "skills": ["Research", "Data Analysis", "Laboratory Skills", "Scientific Writing", "Innovation"],
-            "duration": "6 Months",
-            "location": "Multiple CSIR Centers",
-            "stipend": "₹24,000/month",
-            "description": "🔬 Advance scientific knowledge! Work with India's premier scientific research organization."
-        },
-        {
-            "company": "Ministry of Electronics & IT",
-            "title": "Digital India Technology Intern",
-            "type": "government",
-            "sector": "Digital Governance",
-            "skills": ["Programming", "Digital Literacy", "Web Development", "Data Management", "Cybersecurity"],
-            "duration": "4 Months",
-            "location": "New Delhi/Pune",
-            "stipend": "₹21,000/month",
-            "description": "💻 Build Digital India! Contribute to nation's digital transformation and e-governance initiatives."
-        },
-        {
-            "company": "BARC",
-            "title": "Nuclear Technology Research Intern",
-            "type": "government",
-            "sector": "Nuclear Research",
-            "skills": ["Engineering", "Research", "Data Analysis", "Safety Protocols", "Technical Documentation"],
-            "duration": "5 Months",
-            "location": "Mumbai/Kalpakkam",
-            "stipend": "₹26,000/month",
-            "description": "⚛️ Power India's future! Work on nuclear technology and contribute to clean energy research."
-        },
-
-        # PRIVATE-BASED INTERNSHIPS (8 options - high quality with competitive stipends)
-        {
-            "company": "TCS (Tata Consultancy Services)",
-            "title": "Software Development Intern",
-            "type": "private-based",
-            "sector": "IT Services",
-            "skills": ["Java", "Python", "Programming", "Problem Solving", "Communication"],
-            "duration": "3 Months",
-            "location": "Multiple Cities",
-            "stipend": "₹30,000/month",
-            "description": "💼 Industry leader experience! Work on enterprise software projects with India's largest IT company."
-        },
-        {
-            "company": "Infosys",
-            "title": "Digital Innovation Intern",
-            "type": "private-based",
-            "sector": "IT Consulting",
-            "skills": ["Digital Technologies", "Innovation", "Cloud Computing", "Problem Solving", "Teamwork"],
-            "duration": "3 Months",
-            "location": "Bangalore/Pune",
-            "stipend": "₹28,000/month",
-            "description": "🌟 Innovation at scale! Work on cutting-edge digital transformation projects with global impact."
-        },
-        {
-            "company": "Wipro",
-            "title": "Technology Solutions Intern",
-            "type": "private-based",
-            "sector": "IT Services",
-            "skills": ["Cloud Computing", "DevOps", "Programming", "Agile", "Learning Agility"],
-            "duration": "4 Months",
-            "location": "Pune/Bangalore",
-            "stipend": "₹32,000/month",
-            "description": "☁️ Future-ready skills! Gain hands-on experience with cloud technologies and modern development practices."
-        },
-        {
-            "company": "Microsoft India",
-            "title": "Technology Trainee",
-            "type": "private-based",
-            "sector": "Technology",
-            "skills": ["Programming", "AI/ML", "Cloud Platforms", "Data Science", "Innovation"],
-            "duration": "3 Months",
-            "location": "Hyderabad/Bangalore",
-            "stipend": "₹40,000/month",
-            "description": "🚀 Global technology experience! Work with cutting-edge Microsoft technologies and AI platforms."
-        },
-        {
-            "company": "Google India",
-            "title": "Software Engineering Intern",
-            "type": "private-based",
-            "sector": "Technology",
-            "skills": ["Programming", "Algorithms", "Data Structures", "Problem Solving", "Software Design"],
-            "duration": "4 Months",
-            "location": "Bangalore/Gurgaon",
-            "stipend": "₹50,000/month",
-            "description": "🌟 Dream opportunity! Work with world-class engineers on products used by billions."
-        },
-        {
-            "company": "Amazon India",
-            "title": "SDE Intern",
-            "type": "private-based",
-            "sector": "E-commerce Technology",
-            "skills": ["Programming", "System Design", "AWS", "Data Structures", "Problem Solving"],
-            "duration": "3 Months",
-            "location": "Bangalore/Hyderabad",
-            "stipend": "₹45,000/month",
-            "description": "📦 Scale at Amazon! Work on systems handling millions of customers and learn cloud technologies."
-        },
-        {
-            "company": "HDFC Bank",
-            "title": "Banking Technology Intern",
-            "type": "private-based",
-            "sector": "Financial Services",
-            "skills": ["Financial Technology", "Data Analysis", "Banking Operations", "Communication", "Excel"],
-            "duration": "3 Months",
-            "location": "Mumbai/Pune",
-            "stipend": "₹25,000/month",
-            "description": "🏦 FinTech innovation! Experience digital banking transformation with India's leading private bank."
-        },
-        {
-            "company": "Accenture",
-            "title": "Technology Consulting Intern",
-            "type": "private-based",
-            "sector": "IT Consulting",
-            "skills": ["Business Analysis", "Technology Consulting", "Communication", "Problem Solving", "Project Management"],
-            "duration": "4 Months",
-            "location": "Multiple Cities",
-            "stipend": "₹27,000/month",
-            "description": "💡 Consulting excellence! Work with global clients on technology transformation projects."
-        }
-    ]
+    # Return balanced top 5 with government priority (scores are written onto the copies)
+    return sort_recommendations_by_match([dict(rec) for rec in DEFAULT_RECOMMENDATIONS], user)
+
+# Gemini recommendations reused for identical prompt inputs (skills, interest, education)
+AI_RECOMMENDATIONS_TTL = 300  # seconds
+AI_RECOMMENDATIONS_CACHE_SIZE = 1000
+_ai_recommendations_cache = {}
+_ai_recommendations_lock = threading.Lock()
+
+# Optional Redis backend so every worker and serverless instance shares those results
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_TIMEOUT = 2  # seconds
+# After a failed Redis call, skip Redis for a while instead of waiting on its timeouts
+REDIS_RETRY_AFTER = 30  # seconds
+_redis_client = None
+_redis_error = None
+_redis_retry_at = 0.0
+_redis_lock = Lock()
+
+def get_redis():
+    """Return the shared Redis client when REDIS_URL is set, connecting on first use.
+
+    Returns None while backing off after a failed call (see redis_unavailable).
+    """
+    global _redis_client, _redis_error
 
-    # Return balanced top 5 with government priority
-    return sort_recommendations_by_match(all_recommendations, user)
+    if _redis_retry_at and time.monotonic() < _redis_retry_at:
+        return None
+
+    if _redis_client or _redis_error or not REDIS_URL:
+        return _redis_client
+
+    with _redis_lock:
+        if _redis_client or _redis_error:
+            return _redis_client
+
+        try:
+            import redis
+            _redis_client = redis.Redis.from_url(
+                REDIS_URL,
+                socket_timeout=REDIS_TIMEOUT,
+                socket_connect_timeout=REDIS_TIMEOUT
+            )
+            print("✅ Redis recommendations cache enabled")
+        except Exception as e:
+            _redis_error = str(e)
+            print(f"⚠️ Redis not available, caching recommendations in memory only: {e}")
+
+    return _redis_client
+
+def redis_unavailable(error):
+    """Use only the in-memory cache for REDIS_RETRY_AFTER seconds after a Redis error"""
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_AFTER
+    logger.debug("⚠️ Redis cache unavailable, retrying in %ss: %s", REDIS_RETRY_AFTER, error)
+
+def _ai_recommendations_redis_key(cache_key):
+    """Redis key for a (skills, interest, qualification) prompt input"""
+    return 'recs:' + hashlib.blake2b(json_dumps(cache_key).encode(), digest_size=16).hexdigest()
+
+def _remember_ai_recommendations(cache_key, recommendations):
+    """Keep recommendations in this process for AI_RECOMMENDATIONS_TTL seconds"""
+    now = time.monotonic()
+    with _ai_recommendations_lock:
+        if len(_ai_recommendations_cache) >= AI_RECOMMENDATIONS_CACHE_SIZE:
+            for key in [key for key, (expires, _) in _ai_recommendations_cache.items() if expires <= now]:
+                del _ai_recommendations_cache[key]
+            if len(_ai_recommendations_cache) >= AI_RECOMMENDATIONS_CACHE_SIZE:
+                _ai_recommendations_cache.clear()
+        _ai_recommendations_cache[cache_key] = (now + AI_RECOMMENDATIONS_TTL, recommendations)
+
+def get_cached_ai_recommendations(cache_key):
+    """Return unexpired raw AI recommendations for these prompt inputs, or None"""
+    with _ai_recommendations_lock:
+        cached = _ai_recommendations_cache.get(cache_key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    redis_client = get_redis()
+    if redis_client:
+        try:
+            payload = redis_client.get(_ai_recommendations_redis_key(cache_key))
+            if payload:
+                recommendations = json_loads(payload)
+                _remember_ai_recommendations(cache_key, recommendations)
+                return recommendations
+        except Exception as e:
+            redis_unavailable(e)
+    return None
+
+def store_ai_recommendations(cache_key, recommendations):
+    """Remember raw AI recommendations for AI_RECOMMENDATIONS_TTL seconds"""
+    _remember_ai_recommendations(cache_key, recommendations)
+
+    redis_client = get_redis()
+    if redis_client:
+        try:
+            redis_client.setex(
+                _ai_recommendations_redis_key(cache_key),
+                AI_RECOMMENDATIONS_TTL,
+                json_dumps(recommendations)
+            )
+        except Exception as e:
+            redis_unavailable(e)
+
+# Recommendations prompt; only the skills, interest and education slots change per user
+RECOMMENDATIONS_PROMPT_TEMPLATE = """
+        Generate 6 internship recommendations for:
+        - Skills: {0}
+        - Interest: {1}
+        - Education: {2}
+
+        IMPORTANT: Include more government internships (ISRO, DRDO, NITI Aayog, etc.)
+
+        JSON format: [{{"company":"Name","title":"Position","type":"government|private-based","sector":"Sector","skills":["skill1","skill2"],"duration":"X Months","location":"City","stipend":"₹X/month","description":"Brief desc"}}]
+        """
+
+# Outermost JSON array in a Gemini reply (first '[' to last ']'), skipping any markdown fences
+JSON_ARRAY_PATTERN = re.compile(r'\[.*\]', re.DOTALL)
 
 # 🔧 ENHANCED: Better error handling and timeout for AI recommendations
 def generate_recommendations_fast(user):
@@ -1945,46 +2679,40 @@ def generate_recommendations_fast(user):
         if not model_instance:
             print("📋 Using enhanced default recommendations (Gemini not available)")
             return get_enhanced_default_recommendations(user)
-            
+        
         # Shorter, more focused prompt for faster response
         user_skills = user.get('skills', 'General')
         if isinstance(user_skills, list):
             skills_str = ', '.join(user_skills)
         else:
             skills_str = str(user_skills)
+        
+        # Same prompt inputs -> same recommendations; skip the Gemini round-trip
+        cache_key = (skills_str, str(user.get('area_of_interest', 'IT')), str(user.get('qualification', 'Graduate')))
+        cached_recommendations = get_cached_ai_recommendations(cache_key)
+        if cached_recommendations is not None:
+            logger.debug("⚡ Using cached AI recommendations")
+            return sort_recommendations_by_match([dict(rec) for rec in cached_recommendations], user)
             
-        prompt = f"""
-        Generate 6 internship recommendations for:
-        - Skills: {skills_str}
-        - Interest: {user.get('area_of_interest', 'IT')}
-        - Education: {user.get('qualification', 'Graduate')}
-
-        IMPORTANT: Include more government internships (ISRO, DRDO, NITI Aayog, etc.)
-
-        JSON format: [{{"company":"Name","title":"Position","type":"government|private-based","sector":"Sector","skills":["skill1","skill2"],"duration":"X Months","location":"City","stipend":"₹X/month","description":"Brief desc"}}]
-        """
+        prompt = RECOMMENDATIONS_PROMPT_TEMPLATE.format(*cache_key)
 
         # 🔧 ENHANCED: Better timeout and error handling
         try:
             response = model_instance.generate_content(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=1000,  # Increased for better responses
-                    temperature=0.7,
-                )
+                generation_config=GEMINI_RECOMMENDATIONS_GENERATION_CONFIG,
+                request_options={'timeout': GEMINI_RECOMMENDATIONS_TIMEOUT}
             )
             
             if not response or not response.text:
                 raise Exception("Empty response from Gemini")
                 
-            recommendations_text = response.text.strip()
-            start_idx = recommendations_text.find('[')
-            end_idx = recommendations_text.rfind(']') + 1
+            json_match = JSON_ARRAY_PATTERN.search(response.text)
             
-            if start_idx != -1 and end_idx != -1:
-                json_str = recommendations_text[start_idx:end_idx]
-                recommendations = json.loads(json_str)
+            if json_match:
+                recommendations = json_loads(json_match.group())
                 print(f"✅ AI generated {len(recommendations)} recommendations")
+                store_ai_recommendations(cache_key, [dict(rec) for rec in recommendations[:6]])
                 return sort_recommendations_by_match(recommendations[:6], user)
             else:
                 print("⚠️ Could not parse AI response format, using fallback")
@@ -2018,14 +2746,6 @@ def login_required(view_function):
     return decorated_function
 
 
-@app.before_request
-def ensure_language_selection():
-    """Guarantee the session language is always set to a supported option."""
-    language = session.get('language')
-    if not language or language not in SUPPORTED_LANGUAGES:
-        session['language'] = DEFAULT_LANGUAGE
-
-
 @app.route('/language/<lang_code>')
 def change_language(lang_code):
     """Persist the requested language in the session and redirect back."""
@@ -2056,12 +2776,30 @@ def inject_translation_helpers():
         'languages': SUPPORTED_LANGUAGES
     }
 
+FLASH_KEEP_ENDPOINTS = frozenset({'login', 'signup', 'logout', 'clear_session', 'index'})
+FLASH_RESET_ON_POST = frozenset({'login', 'signup'})
+
 @app.before_request
-def clear_stale_flash_messages():
-    """Clear flash messages for non-authenticated users"""
-    if request.endpoint not in ['login', 'signup', 'logout', 'clear_session', 'index'] and not session.get('logged_in'):
-        if '_flashes' in session:
+def prepare_session():
+    """Per-request session upkeep, run as a single hook.
+
+    Guarantees the session language is a supported option, then drops stale flash
+    messages in one place so the session is only rewritten when needed.
+    """
+    language = session.get('language')
+    if not language or language not in SUPPORTED_LANGUAGES:
+        session['language'] = DEFAULT_LANGUAGE
+
+    if '_flashes' not in session:
+        return
+
+    endpoint = request.endpoint
+    if endpoint in FLASH_RESET_ON_POST:
+        # A fresh login/signup submission starts with a clean message list
+        if request.method == 'POST':
             session.pop('_flashes', None)
+    elif endpoint not in FLASH_KEEP_ENDPOINTS and not session.get('logged_in'):
+        session.pop('_flashes', None)
 
 @app.context_processor
 def inject_user():
@@ -2097,10 +2835,24 @@ def manifest():
     """Return PWA manifest file"""
     return send_from_directory('static', 'manifest.json', mimetype='application/json')
 
+# offline.html has no template logic, so it is rendered once per process
+_offline_page = None
+OFFLINE_PAGE_CACHE_CONTROL = 'public, max-age=300'
+
 @app.route('/offline.html')
 def offline():
     """Return offline page for PWA"""
-    return render_template('offline.html')
+    global _offline_page
+
+    if _offline_page is None:
+        html = render_template('offline.html').encode('utf-8')
+        _offline_page = (html, hashlib.md5(html).hexdigest())
+
+    html, etag = _offline_page
+    response = make_response(html)
+    response.headers['Cache-Control'] = OFFLINE_PAGE_CACHE_CONTROL
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 # 🔧 FIXED: Home route with better profile completion check and debug logging
 @app.route('/home')
@@ -2112,11 +2864,11 @@ def home():
         return redirect(url_for('login'))
     
     # 🔧 FIXED: Add debug logging and improved profile completion check
-    print(f"🔍 DEBUG: User {user['id']} accessing home")
-    print(f"🔍 DEBUG: profile_completed = {user.get('profile_completed')}")
-    print(f"🔍 DEBUG: registration_completed = {user.get('registration_completed')}")
-    print(f"🔍 DEBUG: full_name = {user.get('full_name')}")
-    print(f"🔍 DEBUG: phone = {user.get('phone')}")
+    logger.debug("🔍 User %s accessing home", user['id'])
+    logger.debug("🔍 profile_completed = %s", user.get('profile_completed'))
+    logger.debug("🔍 registration_completed = %s", user.get('registration_completed'))
+    logger.debug("🔍 full_name = %s", user.get('full_name'))
+    logger.debug("🔍 phone = %s", user.get('phone'))
     
     # 🔧 IMPROVED: More flexible profile completion check
     # Consider profile complete if user has basic info filled OR profile_completed flag is True
@@ -2127,8 +2879,8 @@ def home():
     
     profile_complete = user.get('profile_completed') == True or has_basic_info
     
-    print(f"🔍 DEBUG: has_basic_info = {has_basic_info}")
-    print(f"🔍 DEBUG: final profile_complete = {profile_complete}")
+    logger.debug("🔍 has_basic_info = %s", has_basic_info)
+    logger.debug("🔍 final profile_complete = %s", profile_complete)
     
     if not profile_complete:
         flash('Please complete your profile first to access all features', 'info')
@@ -2157,29 +2909,20 @@ def login():
         remember = request.form.get('remember')
         captcha_answer = request.form.get('captcha', '')
         
-        # Clear any existing flash messages
-        session.pop('_flashes', None)
-        
         # Basic validation
         if not email or not password:
             flash('📝 Please enter both email and password', 'error')
             # Generate new captcha for the form
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('login.html', captcha_question=captcha_question)
+            return render_captcha_page('login.html')
         
         # Captcha verification
         if not captcha_answer:
             flash('🔒 Please solve the captcha', 'error')
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('login.html', captcha_question=captcha_question)
+            return render_captcha_page('login.html')
         
         if not verify_captcha(captcha_answer, session.get('captcha_answer')):
             flash('❌ Incorrect captcha. Please try again.', 'error')
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('login.html', captcha_question=captcha_question)
+            return render_captcha_page('login.html')
         
         # Email format validation
         if not validate_email(email):
@@ -2208,14 +2951,10 @@ def login():
                 flash('❌ No account found with this email address.', 'error')
                 flash('💡 Don\'t have an account? Sign up to get started!', 'info')
             # Generate new captcha for retry
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('login.html', captcha_question=captcha_question)
+            return render_captcha_page('login.html')
     
     # GET request - generate captcha
-    captcha_question, captcha_answer_correct = generate_captcha()
-    session['captcha_answer'] = captcha_answer_correct
-    return render_template('login.html', captcha_question=captcha_question)
+    return render_captcha_page('login.html')
 
 # 🔧 ENHANCED: Signup route with auto-login after successful account creation
 @app.route('/signup', methods=['GET', 'POST'])
@@ -2227,52 +2966,32 @@ def signup():
         confirm_password = request.form.get('confirm_password', '')
         captcha_answer = request.form.get('captcha', '')
         
-        session.pop('_flashes', None)
-        
         # Validation
         if not full_name or not email or not password or not confirm_password:
             flash('All fields are required', 'error')
             # Generate new captcha for the form
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('signup.html', captcha_question=captcha_question)
+            return render_captcha_page('signup.html')
         
         # Captcha verification
         if not captcha_answer:
             flash('🔒 Please solve the captcha', 'error')
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('signup.html', captcha_question=captcha_question)
+            return render_captcha_page('signup.html')
         
         if not verify_captcha(captcha_answer, session.get('captcha_answer')):
             flash('❌ Incorrect captcha. Please try again.', 'error')
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('signup.html', captcha_question=captcha_question)
+            return render_captcha_page('signup.html')
         
         if len(full_name.strip()) < 2:
             flash('Full name must be at least 2 characters long', 'error')
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('signup.html', captcha_question=captcha_question)
+            return render_captcha_page('signup.html')
         
         if not validate_email(email):
             flash('Please enter a valid email address', 'error')
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('signup.html', captcha_question=captcha_question)
-        
-        if check_email_exists(email):
-            flash('This email is already registered. Please use a different email or try logging in.', 'error')
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('signup.html', captcha_question=captcha_question)
+            return render_captcha_page('signup.html')
         
         if password != confirm_password:
             flash('Passwords do not match', 'error')
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('signup.html', captcha_question=captcha_question)
+            return render_captcha_page('signup.html')
         
         is_valid, message = validate_password(password)
         if not is_valid:
@@ -2297,14 +3016,10 @@ def signup():
         else:
             flash(message, 'error')
             # Generate new captcha for retry
-            captcha_question, captcha_answer_correct = generate_captcha()
-            session['captcha_answer'] = captcha_answer_correct
-            return render_template('signup.html', captcha_question=captcha_question)
+            return render_captcha_page('signup.html')
     
     # GET request - generate captcha
-    captcha_question, captcha_answer_correct = generate_captcha()
-    session['captcha_answer'] = captcha_answer_correct
-    return render_template('signup.html', captcha_question=captcha_question)
+    return render_captcha_page('signup.html')
 
 @app.route('/logout', methods=['GET', 'POST'])
 def logout():
@@ -2356,17 +3071,9 @@ def save_profile():
         form_data = request.get_json()
         
         # Convert numeric fields
-        if 'qualification_marks' in form_data:
-            try:
-                form_data['qualification_marks'] = float(form_data['qualification_marks'])
-            except (TypeError, ValueError):
-                form_data['qualification_marks'] = None
-        
-        if 'course_marks' in form_data:
-            try:
-                form_data['course_marks'] = float(form_data['course_marks'])
-            except (TypeError, ValueError):
-                form_data['course_marks'] = None
+        for marks_field in ('qualification_marks', 'course_marks'):
+            if marks_field in form_data:
+                form_data[marks_field] = parse_marks(form_data[marks_field])
         
         # Add profile completion flags
         form_data.update({
@@ -2391,6 +3098,22 @@ def save_profile():
         print(f"Profile update error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Profile checkbox options, in the order they are stored
+PROFILE_SKILL_FIELDS = (
+    'react', 'python', 'java', 'cpp', 'html', 'css', 'javascript', 'ai-ml', 'cloud',
+    'nodejs', 'database', 'devops',  # Technical skills
+    'leadership', 'communication', 'digital-marketing', 'content-writing', 'project-management',
+    'teamwork', 'problem-solving', 'analytical',  # Non-technical skills
+)
+PROFILE_LANGUAGE_FIELDS = ('english', 'hindi', 'tamil', 'telugu', 'bengali', 'kannada', 'marathi', 'other')
+
+def checked_profile_options(options, field_prefix, list_field):
+    """Options ticked either as `<prefix><option>` checkboxes or in the `list_field` list"""
+    checked = set(request.form.getlist(list_field))
+    checked.update(key[len(field_prefix):] for key, value in request.form.items()
+                   if value and key.startswith(field_prefix))
+    return [option for option in options if option in checked]
+
 # 🔧 FIXED: Profile route with separate career objective and area of interest
 @app.route('/profile', methods=['GET', 'POST'])
 @login_required
@@ -2404,51 +3127,29 @@ def profile():
         try:
             # Handle file uploads
             uploaded_files = {}
-            file_fields = ['qualificationCertificate', 'additionalCertificates', 'internshipCertificate']
+            upload_dir = None
+            upload_prefix = datetime.now().strftime('%Y%m%d_%H%M%S_')
             
-            for field_name in file_fields:
+            for field_name, db_field in CERTIFICATE_UPLOAD_FIELDS.items():
                 if field_name in request.files:
-                    files = request.files.getlist(field_name)
                     saved_files = []
-                    for file in files:
+                    for file in request.files.getlist(field_name):
                         if file and file.filename and allowed_file(file.filename):
-                            filename = secure_filename(file.filename)
-                            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-                            filename = timestamp + filename
-                            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                            filename = upload_prefix + secure_filename(file.filename)
                             try:
-                                file.save(file_path)
+                                if upload_dir is None:
+                                    upload_dir = _ensure_dir(app.config['UPLOAD_FOLDER'])
+                                save_upload(file, os.path.join(upload_dir, filename))
                                 saved_files.append(filename)
                             except Exception as e:
                                 print(f"File save error: {e}")
                     
                     if saved_files:
-                        db_field_map = {
-                            'qualificationCertificate': 'qualification_certificate',
-                            'additionalCertificates': 'additional_certificates',
-                            'internshipCertificate': 'internship_certificate'
-                        }
-                        db_field = db_field_map.get(field_name, field_name)
-                        uploaded_files[db_field] = json.dumps(saved_files)
-
-            # Collect skills from checkboxes - UPDATED with new skills
-            skills_list = []
-            skill_fields = ['react', 'python', 'java', 'cpp', 'html', 'css', 'javascript', 'ai-ml', 'cloud', 
-                           'nodejs', 'database', 'devops',  # New technical skills
-                           'leadership', 'communication', 'digital-marketing', 'content-writing', 'project-management',
-                           'teamwork', 'problem-solving', 'analytical']  # New non-technical skills
-            
-            for skill in skill_fields:
-                if request.form.get(f'skill_{skill}') or skill in request.form.getlist('skills'):
-                    skills_list.append(skill)
-            
-            # Collect languages from checkboxes
-            languages_list = []
-            language_fields = ['english', 'hindi', 'tamil', 'telugu', 'bengali', 'kannada', 'marathi', 'other']
-            
-            for lang in language_fields:
-                if request.form.get(f'lang_{lang}') or lang in request.form.getlist('languages'):
-                    languages_list.append(lang)
+                        uploaded_files[db_field] = json_dumps(saved_files)
+
+            # Collect skills and languages from checkboxes in one pass over the form
+            skills_list = checked_profile_options(PROFILE_SKILL_FIELDS, 'skill_', 'skills')
+            languages_list = checked_profile_options(PROFILE_LANGUAGE_FIELDS, 'lang_', 'languages')
 
             # 🔧 FIXED: Handle Career Objective and Area of Interest SEPARATELY
             # Career Objective = user's typed content in textarea (objective field)
@@ -2461,8 +3162,8 @@ def profile():
             if not area_interest and user:
                 area_interest = user.get('area_of_interest', '')
 
-            print(f"🔍 DEBUG: career_objective (user typed) = '{career_objective}'")
-            print(f"🔍 DEBUG: area_interest (dropdown) = '{area_interest}'")
+            logger.debug("🔍 career_objective (user typed) = '%s'", career_objective)
+            logger.debug("🔍 area_interest (dropdown) = '%s'", area_interest)
 
             # Process form data matching your database schema
             form_data = {
@@ -2475,11 +3176,11 @@ def profile():
                 'career_objective': career_objective,  # 🔧 NEW: Store user's career objective separately
                 'area_of_interest': area_interest,     # 🔧 SEPARATE: Store dropdown selection
                 'qualification': request.form.get('qualification', ''),
-                'qualification_marks': float(request.form.get('qualificationMarks', 0)) if request.form.get('qualificationMarks') else None,
+                'qualification_marks': parse_marks(request.form.get('qualificationMarks')),
                 'course': request.form.get('course', '').strip(),
-                'course_marks': float(request.form.get('courseMarks', 0)) if request.form.get('courseMarks') else None,
-                'skills': json.dumps(skills_list) if skills_list else json.dumps([]),
-                'languages': json.dumps(languages_list) if languages_list else json.dumps([]),
+                'course_marks': parse_marks(request.form.get('courseMarks')),
+                'skills': json_dumps(skills_list) if skills_list else json_dumps([]),
+                'languages': json_dumps(languages_list) if languages_list else json_dumps([]),
                 'experience': request.form.get('experience', ''),
                 'prior_internship': request.form.get('priorInternship', '')
             }
@@ -2497,7 +3198,7 @@ def profile():
                 flash('Profile saved successfully! 🎉', 'success')
                 
                 # 🔧 FIXED: Redirect to home page after successful profile save
-                print(f"🔍 DEBUG: Profile saved successfully, redirecting to home")
+                logger.debug("🔍 Profile saved successfully, redirecting to home")
                 return redirect(url_for('home'))
             else:
                 flash('Failed to update profile. Please try again.', 'error')
@@ -2586,12 +3287,12 @@ def chat():
         user_email = session.get('user_email', '')
         
         # Track response time for performance optimization
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         # Get ultra-responsive enhanced response
         bot_response = get_gemini_response(user_message, user_name, user_email)
         
-        response_time = (datetime.now() - start_time).total_seconds()
+        response_time = time.perf_counter() - start_time
         
         # Log conversation with performance metrics
         log_conversation(user_message, bot_response, session.get('user_id'), response_time)
@@ -2693,6 +3394,7 @@ def debug_users():
         return "Not available in production"
     
     try:
+        supabase = get_supabase()
         if not supabase:
             return "Database connection not available"
         
@@ -2709,9 +3411,95 @@ def debug_users():
         return f"Error: {e}"
 
 
+@lru_cache(maxsize=None)
+def _cv_pdf_styles():
+    """Build the CV paragraph/table styles once; they are read-only during doc.build."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+
+    subtitle_style = ParagraphStyle(
+        'CustomSubtitle',
+        parent=styles['Normal'],
+        fontSize=12,
+        textColor=colors.HexColor('#7f8c8d'),
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        fontName='Helvetica'
+    )
+
+    section_style = ParagraphStyle(
+        'SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#3498db'),
+        spaceBefore=15,
+        spaceAfter=8,
+        fontName='Helvetica-Bold',
+        borderWidth=1,
+        borderColor=colors.HexColor('#3498db'),
+        borderPadding=5
+    )
+
+    content_style = ParagraphStyle(
+        'Content',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=6,
+        fontName='Helvetica'
+    )
+
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.HexColor('#7f8c8d'),
+        alignment=TA_CENTER,
+        fontName='Helvetica-Oblique'
+    )
+
+    table_style = TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#3498db')),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ])
+
+    return {
+        'title': title_style,
+        'subtitle': subtitle_style,
+        'section': section_style,
+        'content': content_style,
+        'footer': footer_style,
+        'table': table_style
+    }
+
 def generate_cv_pdf(user):
     """Generate a professional CV PDF from user profile data"""
     try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+
         buffer = io.BytesIO()
 
         doc = SimpleDocTemplate(
@@ -2723,49 +3511,11 @@ def generate_cv_pdf(user):
             bottomMargin=40
         )
 
-        styles = getSampleStyleSheet()
-
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#7f8c8d'),
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName='Helvetica'
-        )
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#3498db'),
-            spaceBefore=15,
-            spaceAfter=8,
-            fontName='Helvetica-Bold',
-            borderWidth=1,
-            borderColor=colors.HexColor('#3498db'),
-            borderPadding=5
-        )
-
-        content_style = ParagraphStyle(
-            'Content',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=6,
-            fontName='Helvetica'
-        )
+        cv_styles = _cv_pdf_styles()
+        title_style = cv_styles['title']
+        subtitle_style = cv_styles['subtitle']
+        section_style = cv_styles['section']
+        content_style = cv_styles['content']
 
         story = []
 
@@ -2797,17 +3547,7 @@ def generate_cv_pdf(user):
 
         if personal_data:
             personal_table = Table(personal_data, colWidths=[2*inch, 4*inch])
-            personal_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#3498db')),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-                ('TOPPADDING', (0, 0), (-1, -1), 2),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ]))
+            personal_table.setStyle(cv_styles['table'])
             story.append(personal_table)
         else:
             story.append(Paragraph("Personal information not provided", content_style))
@@ -2833,17 +3573,7 @@ def generate_cv_pdf(user):
 
         if education_data:
             education_table = Table(education_data, colWidths=[2*inch, 4*inch])
-            education_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#3498db')),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-                ('TOPPADDING', (0, 0), (-1, -1), 2),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ]))
+            education_table.setStyle(cv_styles['table'])
             story.append(education_table)
 
         story.append(Spacer(1, 0.1*inch))
@@ -2898,15 +3628,7 @@ def generate_cv_pdf(user):
             story.append(Spacer(1, 0.1*inch))
 
         story.append(Spacer(1, 0.3*inch))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#7f8c8d'),
-            alignment=TA_CENTER,
-            fontName='Helvetica-Oblique'
-        )
-        story.append(Paragraph("Generated from PM Internship Scheme Profile", footer_style))
+        story.append(Paragraph("Generated from PM Internship Scheme Profile", cv_styles['footer']))
 
         doc.build(story)
 
@@ -2920,11 +3642,14 @@ def generate_cv_pdf(user):
         return None
 
 
+CV_FILENAME_STRIP_PATTERN = re.compile(r'[^\w\s-]')
+CV_FILENAME_SEPARATOR_PATTERN = re.compile(r'[-\s]+')
+
 def get_cv_filename(user):
     """Generate a clean filename for the CV"""
     name = user.get('full_name', 'User')
-    clean_name = re.sub(r'[^\w\s-]', '', name)
-    clean_name = re.sub(r'[-\s]+', '_', clean_name)
+    clean_name = CV_FILENAME_STRIP_PATTERN.sub('', name)
+    clean_name = CV_FILENAME_SEPARATOR_PATTERN.sub('_', clean_name)
     return f"{clean_name}_CV.pdf"
 
 @app.route('/preview-cv')
@@ -2941,7 +3666,7 @@ def preview_cv():
         return redirect(url_for('profile'))
     
     try:
-        print(f"🔍 DEBUG: Starting CV generation for user: {user.get('full_name', 'Unknown')}")
+        logger.debug("🔍 Starting CV generation for user: %s", user.get('full_name', 'Unknown'))
         
         # FIXED: Check if generate_cv_pdf function exists and is callable
         if 'generate_cv_pdf' not in globals():
@@ -2951,7 +3676,7 @@ def preview_cv():
         
         # Generate the PDF binary data
         pdf_data = generate_cv_pdf(user)
-        print(f"🔍 DEBUG: PDF generation returned data of type: {type(pdf_data)}")
+        logger.debug("🔍 PDF generation returned data of type: %s", type(pdf_data))
         
         if pdf_data and len(pdf_data) > 0:
             print(f"✅ PDF generated successfully, size: {len(pdf_data)} bytes")
@@ -3030,10 +3755,23 @@ def download_cv():
         flash('Error downloading CV. Please try again.', 'error')
         return redirect(url_for('profile'))
 
-from ats import ProfessionalATSAnalyzer
+# ATS analyzer (lazy-loaded; pulls in PyPDF2 and python-docx)
+_ats_analyzer = None
+_ats_lock = Lock()
+
+def get_ats_analyzer():
+    """Create the shared ProfessionalATSAnalyzer on first CV analysis."""
+    global _ats_analyzer
+
+    if _ats_analyzer is not None:
+        return _ats_analyzer
+
+    with _ats_lock:
+        if _ats_analyzer is None:
+            from ats import ProfessionalATSAnalyzer
+            _ats_analyzer = ProfessionalATSAnalyzer()
 
-# Initialize the analyzer
-ats_analyzer = ProfessionalATSAnalyzer()
+    return _ats_analyzer
 
 @app.route('/analyze-cv', methods=['POST'])
 @login_required
@@ -3056,11 +3794,11 @@ def analyze_cv():
         
         # Save uploaded file temporarily
         filename = secure_filename(cv_file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"temp_{filename}")
-        cv_file.save(file_path)
+        file_path = os.path.join(_ensure_dir(app.config['UPLOAD_FOLDER']), f"temp_{filename}")
+        save_upload(cv_file, file_path)
         
         # Analyze the CV
-        analysis_result = ats_analyzer.calculate_comprehensive_ats_score(
+        analysis_result = get_ats_analyzer().calculate_comprehensive_ats_score(
             file_path, 
             job_description, 
             user_profile=user
@@ -4,11 +4,12 @@ from docx import Document
 import re
 import os
 from collections import Counter, defaultdict
-import difflib
 import json
 from datetime import datetime
 import math
 
+from text_similarity import similarity_ratio
+
 class ProfessionalATSAnalyzer:
     def __init__(self):
         self.skill_database = self.load_industry_skill_database()
@@ -151,7 +152,7 @@ class ProfessionalATSAnalyzer:
             if keyword.lower() in [rk.lower() for rk in resume_keywords]:
                 match_score = 100
             # Check semantic match
-            elif any(difflib.SequenceMatcher(None, keyword.lower(), rk.lower()).ratio() > 0.85 
+            elif any(similarity_ratio(keyword.lower(), rk.lower()) > 0.85 
                     for rk in resume_keywords):
                 match_score = 80
             # Check contextual match
@@ -481,7 +482,7 @@ class ProfessionalATSAnalyzer:
                 # Fuzzy match for variations
                 else:
                     for word in text_lower.split():
-                        if difflib.SequenceMatcher(None, skill.lower(), word).ratio() > 0.85:
+                        if similarity_ratio(skill.lower(), word) > 0.85:
                             skills.append(skill)
                             break
         
@@ -557,7 +558,7 @@ class ProfessionalATSAnalyzer:
         skill_lower = skill.lower()
         
         for resume_skill in resume_skills:
-            if difflib.SequenceMatcher(None, skill_lower, resume_skill.lower()).ratio() > 0.8:
+            if similarity_ratio(skill_lower, resume_skill.lower()) > 0.8:
                 return True
         return False
 
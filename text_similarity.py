@@ -0,0 +1,14 @@
+# text_similarity.py - string similarity shared by app.py and ats.py
+import difflib
+
+# rapidfuzz scores string similarity in C++; difflib stays as the fallback
+try:
+    from rapidfuzz.fuzz import ratio as _fuzz_ratio
+
+    def similarity_ratio(a, b):
+        """Similarity of two strings in [0, 1]."""
+        return _fuzz_ratio(a, b) / 100.0
+except ImportError:
+    def similarity_ratio(a, b):
+        """Similarity of two strings in [0, 1]."""
+        return difflib.SequenceMatcher(None, a, b).ratio()